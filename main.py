@@ -23,29 +23,83 @@ def main():
     )
     parser.add_argument(
         "source_folder",
+        nargs="?",
         type=existing_dir,
-        help="A pasta de origem a ser analisada.",
+        help="A pasta de origem a ser analisada (dispensada com --diff).",
     )
     parser.add_argument(
         "--organize",
         action="store_true",
         help="Organiza os arquivos em pastas por tipo (Videos, Textos, Outros). Imagens permanecem na pasta atual.",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma uma organização interrompida a partir do último checkpoint.",
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="ARQUIVO",
+        help="Arquivo TOML/YAML com regras de organização por tipo, extensão, tamanho e idade.",
+    )
+    parser.add_argument(
+        "--on-collision",
+        choices=("counter", "hash"),
+        default="counter",
+        help="Como renomear arquivos com nome já existente no destino: "
+        "'counter' gera 'nome (1).ext', 'hash' usa um sufixo com o hash do conteúdo. "
+        "Arquivos idênticos são removidos como duplicados.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Exibe estatísticas de tamanho, tipo, extensão e data dos arquivos.",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="SAIDA",
+        help="Grava um snapshot binário ordenado da pasta no arquivo SAIDA.",
+    )
+    parser.add_argument(
+        "--hash",
+        action="store_true",
+        help="Com --snapshot, inclui o hash do conteúdo (detecta renomeações entre sistemas de arquivos).",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("ANTIGO", "NOVO"),
+        help="Compara dois snapshots gravados com --snapshot.",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
         help="Retorna o resultado em formato JSON (útil para integração com frontend).",
     )
     args = parser.parse_args()
+    if args.source_folder is None and args.diff is None:
+        parser.error("informe a pasta de origem")
 
     try:
         from photo_organizer.controller import PhotoOrganizerController
 
         controller = PhotoOrganizerController()
 
-        if args.organize:
+        if args.diff:
+            result = controller.diff_snapshots_endpoint(*args.diff)
+        elif args.snapshot:
+            result = controller.export_snapshot_endpoint(
+                str(args.source_folder), args.snapshot, with_hash=args.hash
+            )
+        elif args.stats:
+            result = controller.folder_statistics_endpoint(str(args.source_folder))
+        elif args.organize or args.resume:
             result = controller.organize_files_endpoint(
-                folder_path=str(args.source_folder), organize=True
+                folder_path=str(args.source_folder),
+                organize=True,
+                resume=args.resume,
+                rules_file=args.rules,
+                collision_strategy=args.on_collision,
             )
         else:
             result = controller.analyze_folder_endpoint(str(args.source_folder))
@@ -54,8 +108,19 @@ def main():
             import json
 
             print(json.dumps(result, indent=2, ensure_ascii=False))
+        elif args.diff:
+            _print_diff_output(result)
+        elif args.snapshot:
+            _print_snapshot_output(result)
+        elif args.stats:
+            _print_stats_output(result, str(args.source_folder))
         else:
-            _print_cli_output(result, args.organize, str(args.source_folder))
+            _print_cli_output(
+                result, args.organize or args.resume, str(args.source_folder)
+            )
+
+        if (args.diff or args.snapshot) and not result["success"]:
+            sys.exit(1)
 
     except Exception as e:
         if hasattr(args, "json") and args.json:
@@ -73,6 +138,33 @@ def main():
         sys.exit(1)
 
 
+def _print_snapshot_output(result: dict):
+    """Formata a gravação de um snapshot para linha de comando."""
+    if not result["success"]:
+        print(f"Erro: {result['message']}", file=sys.stderr)
+        return
+
+    print(result["message"])
+
+
+def _print_diff_output(result: dict):
+    """Formata a comparação de snapshots para linha de comando."""
+    if not result["success"]:
+        print(f"Erro: {result['message']}", file=sys.stderr)
+        return
+
+    data = result["data"]
+    print(result["message"])
+    for path in data["added"]:
+        print(f"  + {path}")
+    for path in data["removed"]:
+        print(f"  - {path}")
+    for path in data["modified"]:
+        print(f"  ~ {path}")
+    for move in data["moved"]:
+        print(f"  > {move['from']} -> {move['to']}")
+
+
 def _print_cli_output(result: dict, organize_mode: bool, source_folder: str):
     """Formata a saída para linha de comando."""
     if not result["success"]:
@@ -106,27 +198,56 @@ def _print_cli_output(result: dict, organize_mode: bool, source_folder: str):
 
         print(f"Total de arquivos analisados: {summary['total_analyzed']}")
 
-        if summary["moved_by_type"]:
+        if summary["moved_by_folder"]:
             print("Arquivos movidos:")
-            for file_type, count in summary["moved_by_type"].items():
-                folder_name = _get_folder_name(file_type)
-                print(f"  • {count} arquivo(s) de {file_type} -> {folder_name}/")
+            for folder_name, count in summary["moved_by_folder"].items():
+                print(f"  • {count} arquivo(s) -> {folder_name}/")
         else:
             print("Nenhum arquivo foi movido.")
 
+        if summary["renamed"] > 0:
+            print(
+                f"  • {summary['renamed']} arquivo(s) renomeado(s) por conflito de nome"
+            )
+        if summary["deduplicated"] > 0:
+            print(f"  • {summary['deduplicated']} duplicado(s) idêntico(s) removido(s)")
+
         if summary["images_remaining"] > 0:
             print(
                 f"  • {summary['images_remaining']} imagem(ns) permaneceu(ram) na pasta atual"
             )
+        if summary["files_kept"] > 0:
+            print(
+                f"  • {summary['files_kept']} arquivo(s) mantido(s) por regra na pasta atual"
+            )
     elif not organize_mode:
         print("\nPara organizar os arquivos em pastas, execute:")
         print(f'python main.py "{source_folder}" --organize')
 
 
-def _get_folder_name(file_type: str) -> str:
-    """Retorna o nome da pasta para um tipo de arquivo."""
-    mapping = {"Vídeo": "Videos", "Texto": "Textos", "Outro": "Outros"}
-    return mapping.get(file_type, "Outros")
+def _print_stats_output(result: dict, source_folder: str):
+    """Formata as estatísticas para linha de comando."""
+    if not result["success"]:
+        print(f"Erro: {result['message']}", file=sys.stderr)
+        return
+
+    stats = result["data"]["statistics"]
+    print(f"Estatísticas da pasta: {source_folder}")
+    print(f"Total: {stats['total_files']} arquivo(s), {stats['total_bytes']} bytes")
+
+    print("\nPor tipo:")
+    for file_type, entry in stats["by_type"].items():
+        print(f"  • {file_type}: {entry['count']} arquivo(s), {entry['bytes']} bytes")
+
+    print("\nFaixas de tamanho:")
+    for label, count in stats["size_histogram"].items():
+        if count:
+            print(f"  • {label}: {count}")
+
+    if stats["largest_files"]:
+        print("\nMaiores arquivos:")
+        for file_info in stats["largest_files"]:
+            print(f"  • {file_info['name']} - {file_info['size']} bytes")
 
 
 if __name__ == "__main__":
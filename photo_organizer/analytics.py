@@ -0,0 +1,159 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .file_handler import FILE_TYPES
+from .models import FileInfo
+
+# Limites (em bytes) das faixas do histograma de tamanhos.
+SIZE_BUCKET_EDGES = np.array(
+    [0, 1024, 1024**2, 10 * 1024**2, 100 * 1024**2, 1024**3, 10 * 1024**3],
+    dtype=np.int64,
+)
+SIZE_BUCKET_LABELS = (
+    "< 1 KB",
+    "1 KB - 1 MB",
+    "1 MB - 10 MB",
+    "10 MB - 100 MB",
+    "100 MB - 1 GB",
+    "1 GB - 10 GB",
+    ">= 10 GB",
+)
+
+
+class ScanAnalytics:
+    """
+    Calcula estatísticas agregadas sobre o resultado de uma varredura.
+
+    Os FileInfo são carregados uma única vez em arrays NumPy colunares
+    (tamanhos, datas de modificação, códigos de tipo e de extensão) e todas
+    as agregações são feitas com operações vetorizadas sobre esses arrays.
+    """
+
+    def __init__(self, files: List[FileInfo]):
+        """
+        Inicializa o ScanAnalytics.
+
+        Args:
+            files (List[FileInfo]): Os arquivos encontrados na varredura.
+        """
+        count = len(files)
+        type_codes = {file_type: code for code, file_type in enumerate(FILE_TYPES)}
+        extension_codes: Dict[str, int] = {}
+
+        self.files = files
+        self.sizes = np.fromiter((f.size for f in files), dtype=np.int64, count=count)
+        self.mtimes = np.fromiter(
+            (f.modified_time for f in files), dtype=np.float64, count=count
+        )
+        self.type_codes = np.fromiter(
+            (type_codes.get(f.file_type, len(FILE_TYPES) - 1) for f in files),
+            dtype=np.int8,
+            count=count,
+        )
+        self.extension_codes = np.fromiter(
+            (
+                extension_codes.setdefault(f.extension.lower(), len(extension_codes))
+                for f in files
+            ),
+            dtype=np.int32,
+            count=count,
+        )
+        self.extensions = list(extension_codes)
+
+    def compute(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Calcula todas as estatísticas de uma vez.
+
+        Args:
+            top_n (int): Quantidade de maiores arquivos a listar.
+
+        Returns:
+            Dict[str, Any]: Totais, histograma de tamanhos, bytes por tipo,
+                            maiores arquivos, estatísticas por extensão e
+                            distribuição por mês de modificação.
+        """
+        return {
+            "total_files": int(self.sizes.size),
+            "total_bytes": int(self.sizes.sum()),
+            "size_histogram": self._size_histogram(),
+            "by_type": self._by_type(),
+            "largest_files": self._largest_files(top_n),
+            "by_extension": self._by_extension(),
+            "by_month": self._by_month(),
+        }
+
+    def _size_histogram(self) -> Dict[str, int]:
+        buckets = np.searchsorted(SIZE_BUCKET_EDGES, self.sizes, side="right") - 1
+        counts = np.bincount(buckets, minlength=len(SIZE_BUCKET_LABELS))
+        return {label: int(count) for label, count in zip(SIZE_BUCKET_LABELS, counts)}
+
+    def _by_type(self) -> Dict[str, Dict[str, int]]:
+        counts = np.bincount(self.type_codes, minlength=len(FILE_TYPES))
+        total_bytes = np.bincount(
+            self.type_codes, weights=self.sizes, minlength=len(FILE_TYPES)
+        )
+        return {
+            file_type: {"count": int(counts[code]), "bytes": int(total_bytes[code])}
+            for code, file_type in enumerate(FILE_TYPES)
+            if counts[code]
+        }
+
+    def _largest_files(self, top_n: int) -> List[Dict[str, Any]]:
+        top_n = min(max(top_n, 0), self.sizes.size)
+        if top_n == 0:
+            return []
+        candidates = np.argpartition(self.sizes, -top_n)[-top_n:]
+        ordered = candidates[np.argsort(self.sizes[candidates], kind="stable")[::-1]]
+        return [
+            {
+                "name": self.files[i].name,
+                "path": self.files[i].path,
+                "size": int(self.sizes[i]),
+            }
+            for i in ordered
+        ]
+
+    def _by_extension(self) -> Dict[str, Dict[str, Any]]:
+        if self.sizes.size == 0:
+            return {}
+        order = np.argsort(self.extension_codes, kind="stable")
+        sorted_codes = self.extension_codes[order]
+        sorted_sizes = self.sizes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+        counts = np.diff(np.r_[starts, sorted_sizes.size])
+        totals = np.add.reduceat(sorted_sizes, starts)
+        minimums = np.minimum.reduceat(sorted_sizes, starts)
+        maximums = np.maximum.reduceat(sorted_sizes, starts)
+
+        labels = [
+            self.extensions[code] or "(sem extensão)" for code in sorted_codes[starts]
+        ]
+
+        return {
+            label: {
+                "count": int(count),
+                "bytes": int(total),
+                "min_size": int(minimum),
+                "max_size": int(maximum),
+                "mean_size": float(total / count),
+            }
+            for label, count, total, minimum, maximum in zip(
+                labels, counts, totals, minimums, maximums
+            )
+        }
+
+    def _by_month(self) -> Dict[str, Dict[str, int]]:
+        known = self.mtimes > 0
+        if not known.any():
+            return {}
+        months = self.mtimes[known].astype("datetime64[s]").astype("datetime64[M]")
+        unique_months, inverse, counts = np.unique(
+            months, return_inverse=True, return_counts=True
+        )
+        total_bytes = np.bincount(inverse, weights=self.sizes[known])
+        return {
+            str(month): {"count": int(count), "bytes": int(size)}
+            for month, count, size in zip(unique_months, counts, total_bytes)
+        }
@@ -0,0 +1,136 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CHECKPOINT_FILE_NAME = ".photo_organizer_checkpoint.json"
+CHECKPOINT_TEMP_FILE_NAME = CHECKPOINT_FILE_NAME + ".tmp"
+CHECKPOINT_VERSION = 2
+
+
+class OrganizationCheckpoint:
+    """
+    Registra o progresso de uma organização em um arquivo de estado compacto.
+
+    Arquivos já movidos ou removidos como duplicados não estão mais na pasta
+    de origem, então uma retomada simplesmente processa o que restou
+    (inclusive arquivos que falharam antes); o checkpoint só guarda os
+    totais dos segmentos anteriores, que são somados ao resultado final.
+
+    O estado é gravado a cada `interval` arquivos e no fim de cada execução,
+    mesmo com exceção ou KeyboardInterrupt. Se o processo for morto sem
+    chance de gravar (SIGKILL, queda de energia), até `interval - 1`
+    movimentações podem faltar nos totais; os arquivos em si ficam corretos.
+    """
+
+    def __init__(self, source_folder: Path, interval: int = 500):
+        """
+        Inicializa o OrganizationCheckpoint.
+
+        Args:
+            source_folder (Path): A pasta sendo organizada.
+            interval (int): Quantidade de arquivos processados entre
+                            gravações do estado em disco.
+        """
+        if interval < 1:
+            raise ValueError(f"Intervalo de checkpoint inválido: {interval}")
+        self.source_folder = source_folder
+        self.path = source_folder / CHECKPOINT_FILE_NAME
+        self.interval = interval
+        self.moved_files: Dict[str, int] = {}
+        self.moved_by_folder: Dict[str, int] = {}
+        self.removed_files: Dict[str, int] = {}
+        self.folders_created: List[str] = []
+        self.outcomes: Dict[str, int] = {}
+        self.segments: int = 0
+        self._pending_writes = 0
+
+    @property
+    def resumed(self) -> bool:
+        return self.segments > 0
+
+    def load(self) -> bool:
+        """
+        Carrega o estado de uma execução anterior, se existir.
+
+        Returns:
+            bool: True se um checkpoint válido para esta pasta foi carregado.
+        """
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+
+        if (
+            not isinstance(state, dict)
+            or state.get("version") != CHECKPOINT_VERSION
+            or state.get("source") != str(self.source_folder)
+        ):
+            return False
+
+        self.moved_files = dict(state.get("moved", {}))
+        self.moved_by_folder = dict(state.get("moved_folders", {}))
+        self.removed_files = dict(state.get("removed", {}))
+        self.folders_created = list(state.get("folders", []))
+        self.outcomes = dict(state.get("outcomes", {}))
+        self.segments = int(state.get("segments", 0)) + 1
+        return True
+
+    def advance(
+        self,
+        folder_name: str,
+        file_type: str,
+        moved: bool = False,
+        outcome: Optional[str] = None,
+    ) -> None:
+        """
+        Contabiliza um arquivo processado e grava periodicamente.
+
+        Args:
+            folder_name (str): A pasta de destino do arquivo.
+            file_type (str): O tipo do arquivo, usado nos totais movidos.
+            moved (bool): Se o arquivo foi efetivamente movido.
+            outcome (Optional[str]): Contador extra a incrementar, como
+                                     "renamed" ou "deduplicated".
+        """
+        if moved:
+            self.moved_files[file_type] = self.moved_files.get(file_type, 0) + 1
+            self.moved_by_folder[folder_name] = (
+                self.moved_by_folder.get(folder_name, 0) + 1
+            )
+        if outcome:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if moved or outcome == "deduplicated":
+            # Saiu da pasta de origem: não aparece na varredura de uma retomada.
+            self.removed_files[file_type] = self.removed_files.get(file_type, 0) + 1
+        self._pending_writes += 1
+        if self._pending_writes >= self.interval:
+            self.save()
+
+    def record_folder(self, folder_name: str) -> None:
+        if folder_name not in self.folders_created:
+            self.folders_created.append(folder_name)
+        self.save()
+
+    def save(self) -> None:
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "source": str(self.source_folder),
+            "moved": self.moved_files,
+            "moved_folders": self.moved_by_folder,
+            "removed": self.removed_files,
+            "folders": self.folders_created,
+            "outcomes": self.outcomes,
+            "segments": self.segments,
+        }
+        temp_path = self.source_folder / CHECKPOINT_TEMP_FILE_NAME
+        temp_path.write_text(
+            json.dumps(state, ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, self.path)
+        self._pending_writes = 0
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        (self.source_folder / CHECKPOINT_TEMP_FILE_NAME).unlink(missing_ok=True)
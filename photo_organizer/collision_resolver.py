@@ -0,0 +1,235 @@
+import hashlib
+import os
+import shutil
+import unicodedata
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Set
+
+COLLISION_STRATEGIES = ("counter", "hash")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class CollisionDecision(NamedTuple):
+    target_name: str
+    duplicate: bool = False
+    renamed: bool = False
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def is_case_insensitive(folder: Path, names: Iterable[str] = ()) -> bool:
+    """
+    Testa se a pasta ignora maiúsculas comparando o stat de um nome (dos
+    informados ou da própria pasta) com o do mesmo nome com a caixa trocada.
+    """
+    candidates = chain(
+        ((folder / name, folder / name.swapcase()) for name in names),
+        [(folder, folder.parent / folder.name.swapcase())],
+    )
+    for path, swapped in candidates:
+        if path.name == swapped.name:
+            continue
+        try:
+            return os.path.samestat(path.lstat(), swapped.lstat())
+        except OSError:
+            return False
+    return False
+
+
+def move_without_replacing(source: Path, target: Path) -> None:
+    """
+    Move um arquivo sem nunca sobrescrever o destino.
+
+    O link + unlink falha com FileExistsError se o nome já estiver ocupado,
+    inclusive com outra caixa em sistemas de arquivos que não diferenciam
+    maiúsculas. Onde não há links (outro dispositivo, FAT), o nome é
+    reservado com criação exclusiva antes da movimentação.
+
+    Args:
+        source (Path): O arquivo a ser movido.
+        target (Path): O caminho de destino, que não pode existir.
+    """
+    try:
+        os.link(source, target, follow_symlinks=False)
+    except (FileExistsError, FileNotFoundError):
+        raise
+    except OSError:
+        with open(target, "xb"):
+            pass
+        try:
+            shutil.move(str(source), str(target))
+        except BaseException:
+            target.unlink(missing_ok=True)
+            raise
+        return
+    try:
+        os.unlink(source)
+    except OSError:
+        os.unlink(target)
+        raise
+
+
+class CollisionResolver:
+    """
+    Escolhe nomes únicos dentro de uma pasta de destino.
+
+    Os nomes existentes são lidos uma única vez (um scandir por pasta) e
+    mantidos em memória; cada decisão é tomada consultando esse conjunto,
+    sem exists() por arquivo. Só quando há colisão de nome o conteúdo é
+    comparado (tamanho e depois hash): arquivos idênticos são tratados como
+    duplicados, os demais recebem "nome (1).ext" ou um sufixo com o hash.
+
+    Em sistemas de arquivos que não diferenciam maiúsculas, os nomes são
+    comparados sem caixa. A movimentação em si nunca sobrescreve: se o
+    conjunto estiver desatualizado, o nome ocupado é registrado e outro é
+    escolhido.
+    """
+
+    def __init__(self, target_folder: Path, strategy: str = "counter"):
+        """
+        Inicializa o CollisionResolver.
+
+        Args:
+            target_folder (Path): A pasta de destino.
+            strategy (str): "counter" para "nome (N).ext" ou "hash" para
+                            "nome-<hash>.ext".
+        """
+        if strategy not in COLLISION_STRATEGIES:
+            raise ValueError(f"Estratégia de colisão inválida: {strategy}")
+        self.target_folder = target_folder
+        self.strategy = strategy
+        self.case_insensitive = False
+        self._names: Optional[Set[str]] = None
+        self._next_counter: Dict[str, int] = {}
+        self._digests: Dict[str, bytes] = {}
+
+    @property
+    def names(self) -> Set[str]:
+        if self._names is None:
+            try:
+                with os.scandir(self.target_folder) as entries:
+                    found = [entry.name for entry in entries]
+            except FileNotFoundError:
+                found = []
+            self.case_insensitive = is_case_insensitive(self.target_folder, found)
+            self._names = {self._key(name) for name in found}
+        return self._names
+
+    def _key(self, name: str) -> str:
+        if self.case_insensitive:
+            return unicodedata.normalize("NFC", name).casefold()
+        return name
+
+    def _taken(self, name: str) -> bool:
+        names = self.names  # Lê a pasta antes de calcular a chave.
+        return self._key(name) in names
+
+    def _target_digest(self, name: str) -> bytes:
+        key = self._key(name)
+        if key not in self._digests:
+            self._digests[key] = _file_digest(self.target_folder / name)
+        return self._digests[key]
+
+    def _is_duplicate(self, source: Path, name: str, source_digest: bytes) -> bool:
+        try:
+            target_stat = (self.target_folder / name).stat()
+            source_stat = source.stat()
+            # O próprio arquivo de origem nunca é duplicado de si mesmo.
+            if os.path.samestat(target_stat, source_stat):
+                return False
+            if target_stat.st_size != source_stat.st_size:
+                return False
+            return self._target_digest(name) == source_digest
+        except OSError:
+            return False
+
+    def _counter_names(self, stem: str, suffix: str) -> Iterator[str]:
+        counter = 1
+        while True:
+            yield f"{stem} ({counter}){suffix}"
+            counter += 1
+
+    def resolve(self, source: Path) -> CollisionDecision:
+        """
+        Decide o nome de destino de um arquivo.
+
+        Args:
+            source (Path): O arquivo a ser movido.
+
+        Returns:
+            CollisionDecision: O nome escolhido e se o arquivo é um duplicado
+                               de um arquivo já existente no destino.
+        """
+        name = source.name
+        if not self._taken(name):
+            return CollisionDecision(name)
+
+        source_digest = _file_digest(source)
+        stem, suffix = source.stem, source.suffix
+
+        # Compara com o arquivo de mesmo nome e com as variantes já geradas.
+        candidates = [name]
+        for variant in self._counter_names(stem, suffix):
+            if not self._taken(variant):
+                break
+            candidates.append(variant)
+        hashed_name = f"{stem}-{source_digest.hex()[:8]}{suffix}"
+        if self._taken(hashed_name):
+            candidates.append(hashed_name)
+        for candidate in candidates:
+            if self._is_duplicate(source, candidate, source_digest):
+                return CollisionDecision(candidate, duplicate=True)
+
+        if self.strategy == "hash" and not self._taken(hashed_name):
+            self._digests[self._key(hashed_name)] = source_digest
+            return CollisionDecision(hashed_name, renamed=True)
+
+        key = f"{stem}\0{suffix}"
+        counter = self._next_counter.get(key, 1)
+        while self._taken(f"{stem} ({counter}){suffix}"):
+            counter += 1
+        self._next_counter[key] = counter + 1
+        new_name = f"{stem} ({counter}){suffix}"
+        self._digests[self._key(new_name)] = source_digest
+        return CollisionDecision(new_name, renamed=True)
+
+    def register(self, name: str) -> None:
+        """Registra um nome recém-ocupado na pasta de destino."""
+        self.names.add(self._key(name))
+
+    def move(self, source: Path) -> CollisionDecision:
+        """
+        Move o arquivo para a pasta de destino com um nome livre.
+
+        Duplicados não são movidos: cabe ao chamador decidir o que fazer
+        com a origem.
+
+        Args:
+            source (Path): O arquivo a ser movido.
+
+        Returns:
+            CollisionDecision: A decisão efetivamente aplicada.
+        """
+        while True:
+            decision = self.resolve(source)
+            if decision.duplicate:
+                return decision
+            try:
+                move_without_replacing(
+                    source, self.target_folder / decision.target_name
+                )
+            except FileExistsError:
+                # Nome ocupado fora do conjunto em memória: registra e tenta
+                # de novo, agora comparando com o arquivo que já está lá.
+                self._digests.pop(self._key(decision.target_name), None)
+                self.register(decision.target_name)
+                continue
+            self.register(decision.target_name)
+            return decision
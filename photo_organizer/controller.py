@@ -1,17 +1,57 @@
-from typing import Any, Dict
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
 
-from .models import OrganizationRequest, OrganizationResult
+from .models import AnalysisResult, FileInfo, OrganizationRequest, OrganizationResult
+from .result_cache import ResultCache
 from .service import PhotoOrganizerService
 
 
 class PhotoOrganizerController:
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None):
         self.service = PhotoOrganizerService()
+        self.cache = cache
 
     def analyze_folder_endpoint(self, folder_path: str) -> Dict[str, Any]:
-        result = self.service.analyze_folder(folder_path)
+        if self.cache is None:
+            return self._analysis_response(
+                self.service.analyze_folder(folder_path, include_video_metadata=True)
+            )
+        return json.loads(self.analyze_folder_json_endpoint(folder_path))
+
+    def analyze_folder_json_endpoint(self, folder_path: str) -> bytes:
+        """
+        Retorna a resposta de análise já serializada em JSON (UTF-8).
+
+        Com cache configurado, uma pasta inalterada é respondida direto do
+        arquivo mapeado, sem varredura nem montagem do JSON.
+        """
+        source_path = Path(folder_path).expanduser().resolve()
+        key = str(source_path)
+        version = None
+
+        if self.cache is not None:
+            cached = self.cache.get(key, source_path)
+            if cached is not None:
+                return cached
+            # O mtime é lido antes da varredura: se a pasta mudar durante a
+            # análise, a próxima consulta já não casa com o cache gravado.
+            version = self.cache.folder_version(source_path)
+
+        result = self.service.analyze_folder(folder_path, include_video_metadata=True)
+        payload = json.dumps(
+            self._analysis_response(result), ensure_ascii=False
+        ).encode("utf-8")
+
+        if result.success and version is not None:
+            try:
+                self.cache.put(key, version, payload)
+            except OSError:
+                pass
+        return payload
 
+    def _analysis_response(self, result: AnalysisResult) -> Dict[str, Any]:
         return {
             "success": result.success,
             "message": result.message,
@@ -19,24 +59,81 @@ class PhotoOrganizerController:
                 "source_folder": result.source_folder,
                 "total_files": result.total_files,
                 "files_by_type": result.files_by_type,
-                "files": [
-                    {
-                        "name": file.name,
-                        "path": file.path,
-                        "extension": file.extension,
-                        "type": file.file_type,
-                        "size": file.size,
-                    }
-                    for file in result.files_found
-                ],
+                "files": [self._file_response(file) for file in result.files_found],
+            },
+            "errors": result.errors,
+        }
+
+    def folder_statistics_endpoint(
+        self, folder_path: str, top_n: int = 10
+    ) -> Dict[str, Any]:
+        result = self.service.analyze_statistics(folder_path, top_n=top_n)
+
+        return {
+            "success": result.success,
+            "message": result.message,
+            "data": {
+                "source_folder": result.source_folder,
+                "total_files": result.total_files,
+                "statistics": result.statistics,
+            },
+            "errors": result.errors,
+        }
+
+    def export_snapshot_endpoint(
+        self, folder_path: str, output_path: str, with_hash: bool = False
+    ) -> Dict[str, Any]:
+        result = self.service.export_snapshot(folder_path, output_path, with_hash)
+
+        return {
+            "success": result.success,
+            "message": result.message,
+            "data": {
+                "source_folder": result.source_folder,
+                "snapshot": result.snapshot_path,
+                "total_entries": result.total_entries,
+            },
+            "errors": result.errors,
+        }
+
+    def diff_snapshots_endpoint(
+        self, old_snapshot: str, new_snapshot: str
+    ) -> Dict[str, Any]:
+        result = self.service.diff_snapshots(old_snapshot, new_snapshot)
+
+        return {
+            "success": result.success,
+            "message": result.message,
+            "data": {
+                "added": result.added,
+                "removed": result.removed,
+                "modified": result.modified,
+                "moved": result.moved,
+                "summary": {
+                    "added": len(result.added),
+                    "removed": len(result.removed),
+                    "modified": len(result.modified),
+                    "moved": len(result.moved),
+                },
             },
             "errors": result.errors,
         }
 
     def organize_files_endpoint(
-        self, folder_path: str, organize: bool = True
+        self,
+        folder_path: str,
+        organize: bool = True,
+        resume: bool = False,
+        rules_file: Optional[str] = None,
+        collision_strategy: str = "counter",
     ) -> Dict[str, Any]:
-        request = OrganizationRequest(source_folder=folder_path, organize=organize)
+        request = OrganizationRequest(
+            source_folder=folder_path,
+            organize=organize,
+            resume=resume,
+            rules_file=rules_file,
+            collision_strategy=collision_strategy,
+        )
 
         result = self.service.organize_files(request)
 
@@ -44,16 +141,7 @@ class PhotoOrganizerController:
             "source_folder": request.source_folder,
             "total_files": result.total_files,
             "files_by_type": result.files_by_type,
-            "files": [
-                {
-                    "name": file.name,
-                    "path": file.path,
-                    "extension": file.extension,
-                    "type": file.file_type,
-                    "size": file.size,
-                }
-                for file in result.files_found
-            ],
+            "files": [self._file_response(file) for file in result.files_found],
         }
 
         if organize:
@@ -90,9 +178,28 @@ class PhotoOrganizerController:
             "errors": [],
         }
 
+    def _file_response(self, file: FileInfo) -> Dict[str, Any]:
+        response: Dict[str, Any] = {
+            "name": file.name,
+            "path": file.path,
+            "extension": file.extension,
+            "type": file.file_type,
+            "size": file.size,
+        }
+        if file.duration_seconds is not None or file.width is not None:
+            response["video"] = {
+                "duration_seconds": file.duration_seconds,
+                "width": file.width,
+                "height": file.height,
+                "codec": file.video_codec,
+                "created_at": file.media_created_at,
+            }
+        return response
+
     def _generate_summary(self, result: OrganizationResult) -> Dict[str, Any]:
         total_moved = sum(result.moved_files.values())
-        files_remaining = result.total_files - total_moved
+        # Duplicados removidos também já não estão na pasta.
+        files_remaining = result.total_files - total_moved - result.deduplicated_files
 
         return {
             "total_analyzed": result.total_files,
@@ -100,4 +207,9 @@ class PhotoOrganizerController:
             "files_remaining": files_remaining,
             "folders_created": result.folders_created,
             "moved_by_type": result.moved_files,
+            "moved_by_folder": result.moved_by_folder,
+            "images_remaining": result.images_remaining,
+            "files_kept": result.files_kept,
+            "renamed": result.renamed_files,
+            "deduplicated": result.deduplicated_files,
         }
@@ -1,8 +1,12 @@
 from pathlib import Path
 from typing import List
 
+from .checkpoint import CHECKPOINT_FILE_NAME, CHECKPOINT_TEMP_FILE_NAME
 from .file_handler import FileHandler
 
+# Arquivos de estado internos que nunca devem ser tratados como conteúdo.
+IGNORED_FILE_NAMES = frozenset({CHECKPOINT_FILE_NAME, CHECKPOINT_TEMP_FILE_NAME})
+
 
 class DirectoryScanner:
     """
@@ -34,9 +38,14 @@ class DirectoryScanner:
             List[FileHandler]: Uma lista de objetos FileHandler
                                representando os arquivos encontrados.
         """
-        files = [
-            FileHandler(file_path)
-            for file_path in self.directory_path.iterdir()
-            if file_path.is_file()
-        ]
+        files = []
+        for file_path in self.directory_path.iterdir():
+            if file_path.name in IGNORED_FILE_NAMES:
+                continue
+            try:
+                files.append(FileHandler(file_path))
+            except ValueError:
+                # Subpasta, ou arquivo movido por uma organização concorrente
+                # entre a listagem e a leitura: a varredura não usa travas.
+                continue
         return files
@@ -1,5 +1,30 @@
 from pathlib import Path
 
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"})
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mov", ".avi", ".mkv", ".flv", ".wmv"})
+TEXT_EXTENSIONS = frozenset({".txt", ".doc", ".docx", ".pdf", ".rtf", ".odt"})
+FILE_TYPES = ("Imagem", "Vídeo", "Texto", "Outro")
+
+
+def get_file_type(extension: str) -> str:
+    """
+    Retorna o tipo de arquivo correspondente a uma extensão.
+
+    Args:
+        extension (str): A extensão, com ponto (ex.: ".mp4").
+
+    Returns:
+        str: O tipo do arquivo (Imagem, Vídeo, Texto, Outro).
+    """
+    extension = extension.lower()
+    if extension in IMAGE_EXTENSIONS:
+        return "Imagem"
+    if extension in VIDEO_EXTENSIONS:
+        return "Vídeo"
+    if extension in TEXT_EXTENSIONS:
+        return "Texto"
+    return "Outro"
+
 
 class FileHandler:
     """
@@ -30,17 +55,7 @@ class FileHandler:
         Returns:
             str: O tipo do arquivo (Imagem, Vídeo, Texto, Outro).
         """
-        image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"}
-        video_extensions = {".mp4", ".mov", ".avi", ".mkv", ".flv", ".wmv"}
-        text_extensions = {".txt", ".doc", ".docx", ".pdf", ".rtf", ".odt"}
-
-        if self.extension.lower() in image_extensions:
-            return "Imagem"
-        if self.extension.lower() in video_extensions:
-            return "Vídeo"
-        if self.extension.lower() in text_extensions:
-            return "Texto"
-        return "Outro"
+        return get_file_type(self.extension)
 
     def __str__(self) -> str:
         return f"Arquivo: {self.name} - Tipo: {self.type}"
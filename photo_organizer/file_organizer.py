@@ -1,77 +1,193 @@
 import shutil
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
+from .checkpoint import OrganizationCheckpoint
+from .collision_resolver import COLLISION_STRATEGIES, CollisionResolver
 from .file_handler import FileHandler
+from .folder_lock import locked_folders
+from .rules import RuleSet
+
+# Grupo dos arquivos mantidos por regras keep. Não colide com nenhuma pasta,
+# já que regras com pasta vazia são rejeitadas na validação.
+KEPT_BY_RULE = ""
 
 
 class FileOrganizer:
-    def __init__(self, base_directory: Path):
+    def __init__(
+        self,
+        base_directory: Path,
+        rules: Optional[RuleSet] = None,
+        collision_strategy: str = "counter",
+        lock_targets: bool = False,
+        lock_dir: Optional[Path] = None,
+    ):
+        if collision_strategy not in COLLISION_STRATEGIES:
+            raise ValueError(f"Estratégia de colisão inválida: {collision_strategy}")
         self.base_directory = base_directory.resolve()
+        self.rules = rules
+        self.collision_strategy = collision_strategy
+        self.lock_targets = lock_targets
+        self.lock_dir = lock_dir
         self.folders_created: List[str] = []
         self.images_remaining_count: int = 0
+        self.files_kept_count: int = 0
+        self.moved_by_folder: Dict[str, int] = {}
+        self.renamed_count: int = 0
+        self.deduplicated_count: int = 0
         if self.base_directory.exists() and not self.base_directory.is_dir():
             raise NotADirectoryError(f"Não é um diretório: {self.base_directory}")
         self.base_directory.mkdir(parents=True, exist_ok=True)
 
-    def organize_files(self, files: List[FileHandler]) -> Dict[str, int]:
-        files_by_type = self._group_files_by_type(files)
-
-        self.images_remaining_count = len(files_by_type.get("Imagem", []))
-        files_by_type.pop("Imagem", None)
-
-        moved_files = {}
-
-        for file_type, file_list in files_by_type.items():
-            if file_list:
-                folder_name = self._get_folder_name(file_type)
-                target_folder = self.base_directory / folder_name
-
-                self._create_folder_if_needed(target_folder)
-
-                moved_count = self._move_files(file_list, target_folder)
-                moved_files[file_type] = moved_count
+    def organize_files(
+        self,
+        files: List[FileHandler],
+        checkpoint: Optional[OrganizationCheckpoint] = None,
+    ) -> Dict[str, int]:
+        files_by_folder = self._group_files_by_folder(files)
+
+        self.images_remaining_count = len(files_by_folder.pop(None, []))
+        self.files_kept_count = len(files_by_folder.pop(KEPT_BY_RULE, []))
+        self._check_targets(files_by_folder)
+
+        moved_files: Dict[str, int] = {}
+
+        # Os destinos são travados antes de qualquer movimentação; sem
+        # lock_targets o chamador é responsável pela exclusão mútua.
+        lock_context = (
+            locked_folders(
+                (self.base_directory / name for name in files_by_folder),
+                self.lock_dir,
+            )
+            if self.lock_targets
+            else nullcontext()
+        )
+        try:
+            with lock_context:
+                for folder_name in sorted(files_by_folder):
+                    file_list = sorted(
+                        files_by_folder[folder_name], key=lambda f: f.name
+                    )
+                    target_folder = self.base_directory / folder_name
+
+                    self._create_folder_if_needed(target_folder, checkpoint)
+
+                    moved_by_type = self._move_files(
+                        file_list, target_folder, folder_name, checkpoint
+                    )
+                    for file_type, count in moved_by_type.items():
+                        moved_files[file_type] = moved_files.get(file_type, 0) + count
+                    if moved_by_type:
+                        self.moved_by_folder[folder_name] = self.moved_by_folder.get(
+                            folder_name, 0
+                        ) + sum(moved_by_type.values())
+        finally:
+            # Grava o progresso parcial também em caso de erro ou interrupção.
+            if checkpoint is not None:
+                checkpoint.save()
 
         return moved_files
 
-    def _group_files_by_type(
+    def _group_files_by_folder(
         self, files: List[FileHandler]
-    ) -> Dict[str, List[FileHandler]]:
-        grouped: Dict[str, List[FileHandler]] = {}
+    ) -> Dict[Optional[str], List[FileHandler]]:
+        grouped: Dict[Optional[str], List[FileHandler]] = {}
         for file in files:
-            if file.type not in grouped:
-                grouped[file.type] = []
-            grouped[file.type].append(file)
+            folder_name = self._resolve_folder(file)
+            if folder_name not in grouped:
+                grouped[folder_name] = []
+            grouped[folder_name].append(file)
         return grouped
 
+    def _check_targets(self, folder_names: Iterable[str]) -> None:
+        # Destinos ficam estritamente dentro da pasta organizada (também após
+        # resolver links simbólicos): é o que garante a ordem global das
+        # travas em locked_folders.
+        for folder_name in folder_names:
+            resolved = (self.base_directory / folder_name).resolve()
+            if resolved == self.base_directory:
+                raise ValueError(
+                    f"A pasta de destino {folder_name} aponta para a pasta organizada"
+                )
+            if not resolved.is_relative_to(self.base_directory):
+                raise ValueError(
+                    f"A pasta de destino {folder_name} aponta para fora da pasta organizada"
+                )
+
+    def _resolve_folder(self, file: FileHandler) -> Optional[str]:
+        """
+        Retorna a pasta de destino do arquivo, None se for uma imagem que
+        permanece ou KEPT_BY_RULE se uma regra keep o mantém.
+        """
+        if self.rules is not None:
+            rule = self.rules.match(file)
+            if rule is not None:
+                return KEPT_BY_RULE if rule.folder is None else rule.folder
+        if file.type == "Imagem":
+            return None
+        return self._get_folder_name(file.type)
+
     def _get_folder_name(self, file_type: str) -> str:
         folder_mapping = {"Vídeo": "Videos", "Texto": "Textos", "Outro": "Outros"}
         return folder_mapping.get(file_type, "Outros")
 
-    def _create_folder_if_needed(self, folder_path: Path) -> None:
+    def _create_folder_if_needed(
+        self,
+        folder_path: Path,
+        checkpoint: Optional[OrganizationCheckpoint] = None,
+    ) -> None:
         if not folder_path.exists():
             folder_path.mkdir(parents=True, exist_ok=True)
-            self.folders_created.append(folder_path.name)
-            print(f"Pasta criada: {folder_path.name}")
-
-    def _move_files(self, files: List[FileHandler], target_folder: Path) -> int:
-        moved_count = 0
+            folder_name = folder_path.relative_to(self.base_directory).as_posix()
+            self.folders_created.append(folder_name)
+            if checkpoint is not None:
+                checkpoint.record_folder(folder_name)
+            print(f"Pasta criada: {folder_name}")
+
+    def _move_files(
+        self,
+        files: List[FileHandler],
+        target_folder: Path,
+        folder_name: str = "",
+        checkpoint: Optional[OrganizationCheckpoint] = None,
+    ) -> Dict[str, int]:
+        moved_files: Dict[str, int] = {}
+        resolver = CollisionResolver(target_folder, self.collision_strategy)
         for file in files:
+            moved = False
+            outcome = None
             try:
-                target_path = target_folder / file.name
-
-                if target_path.exists():
-                    print(f"Aviso: Arquivo já existe no destino, pulando: {file.name}")
-                    continue
-
-                shutil.move(str(file.path), str(target_path))
-                moved_count += 1
-                print(f"Movido: {file.name} -> {target_folder.name}/")
+                decision = resolver.move(file.path)
+
+                if decision.duplicate:
+                    file.path.unlink()
+                    outcome = "deduplicated"
+                    self.deduplicated_count += 1
+                    print(
+                        f"Duplicado removido: {file.name} "
+                        f"(idêntico a {folder_name}/{decision.target_name})"
+                    )
+                else:
+                    moved = True
+                    moved_files[file.type] = moved_files.get(file.type, 0) + 1
+                    if decision.renamed:
+                        outcome = "renamed"
+                        self.renamed_count += 1
+                        print(
+                            f"Movido: {file.name} -> "
+                            f"{folder_name}/{decision.target_name} (renomeado)"
+                        )
+                    else:
+                        print(f"Movido: {file.name} -> {folder_name}/")
 
             except (OSError, shutil.Error) as e:
                 print(f"Erro ao mover {file.name}: {e}")
 
-        return moved_count
+            if checkpoint is not None:
+                checkpoint.advance(folder_name, file.type, moved, outcome)
+
+        return moved_files
 
     def get_organization_summary(
         self, moved_files: Dict[str, int], total_files: int
@@ -85,13 +201,10 @@ class FileOrganizer:
 
         summary.append(f"Total de arquivos analisados: {total_files}")
 
-        if moved_files:
+        if self.moved_by_folder:
             summary.append("Arquivos movidos:")
-            for file_type, count in moved_files.items():
-                folder_name = self._get_folder_name(file_type)
-                summary.append(
-                    f"  • {count} arquivo(s) de {file_type} -> {folder_name}/"
-                )
+            for folder_name, count in self.moved_by_folder.items():
+                summary.append(f"  • {count} arquivo(s) -> {folder_name}/")
         else:
             summary.append("Nenhum arquivo foi movido.")
 
@@ -99,5 +212,9 @@ class FileOrganizer:
             summary.append(
                 f"  • {self.images_remaining_count} imagem(ns) permaneceu(ram) na pasta atual"
             )
+        if self.files_kept_count > 0:
+            summary.append(
+                f"  • {self.files_kept_count} arquivo(s) mantido(s) por regra na pasta atual"
+            )
 
         return "\n".join(summary)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+from .collision_resolver import is_case_insensitive
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plataformas sem fcntl (Windows)
+    fcntl = None
+
+LOCK_DIR_ENV = "PHOTO_ORGANIZER_LOCK_DIR"
+
+# Chaves travadas por cada thread, para falhar em vez de travar duas vezes.
+_thread_state = threading.local()
+
+
+def default_lock_dir() -> Path:
+    return Path(
+        os.environ.get(LOCK_DIR_ENV)
+        or Path(tempfile.gettempdir()) / "photo_organizer_locks"
+    )
+
+
+def lock_key(folder: Path) -> str:
+    """
+    Retorna a forma canônica do caminho usada para identificar a trava.
+
+    Links simbólicos e componentes "." e ".." são resolvidos; em sistemas de
+    arquivos que não diferenciam maiúsculas, a caixa também é ignorada.
+    """
+    path = Path(folder).expanduser().resolve()
+    existing = path
+    while not existing.exists() and existing != existing.parent:
+        existing = existing.parent
+    key = os.path.normcase(str(path))
+    if is_case_insensitive(existing):
+        key = key.casefold()
+    return key
+
+
+def _held_keys() -> Set[str]:
+    held = getattr(_thread_state, "keys", None)
+    if held is None:
+        held = _thread_state.keys = set()
+    return held
+
+
+class FolderLock:
+    """
+    Trava consultiva (fcntl.flock) exclusiva para uma pasta.
+
+    O arquivo de trava fica fora da pasta travada, em um diretório comum
+    nomeado pelo hash do caminho, para não aparecer nas varreduras. A trava
+    vale entre processos e também entre threads do mesmo processo, já que
+    cada instância abre seu próprio descritor. Em plataformas sem fcntl a
+    trava não tem efeito.
+
+    Caminhos diferentes para a mesma pasta (links simbólicos, caixa) usam a
+    mesma trava. Pedir com espera uma trava que a própria thread já mantém
+    gera RuntimeError em vez de um deadlock.
+    """
+
+    def __init__(self, folder: Path, lock_dir: Optional[Path] = None):
+        """
+        Inicializa o FolderLock.
+
+        Args:
+            folder (Path): A pasta a ser travada.
+            lock_dir (Optional[Path]): Onde criar os arquivos de trava.
+                Padrão: $PHOTO_ORGANIZER_LOCK_DIR ou a pasta temporária.
+        """
+        self.folder = folder
+        self.lock_dir = lock_dir or default_lock_dir()
+        self.key = lock_key(folder)
+        digest = hashlib.sha1(self.key.encode("utf-8", "surrogateescape"))
+        self.path = self.lock_dir / f"{digest.hexdigest()}.lock"
+        self._fd: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Adquire a trava.
+
+        Args:
+            blocking (bool): Se deve esperar a trava ser liberada.
+
+        Returns:
+            bool: True se a trava foi adquirida.
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Trava já adquirida: {self.folder}")
+        if blocking and self.key in _held_keys():
+            raise RuntimeError(
+                f"A pasta já está travada por esta thread: {self.folder}"
+            )
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            except OSError:
+                os.close(fd)
+                raise
+        self._fd = fd
+        _held_keys().add(self.key)
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            _held_keys().discard(self.key)
+
+    def __enter__(self) -> "FolderLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+@contextmanager
+def locked_folders(
+    folders: Iterable[Path], lock_dir: Optional[Path] = None
+) -> Iterator[None]:
+    """
+    Trava várias pastas de uma vez.
+
+    As travas são adquiridas em ordem de componentes do caminho canônico,
+    em que uma pasta sempre vem antes das suas subpastas. O FileOrganizer
+    rejeita destinos que, resolvidos os links simbólicos, não ficam dentro
+    da pasta de origem; assim a origem é ancestral de todos os destinos,
+    todo processo trava na mesma ordem global e não há deadlock entre
+    organizações concorrentes. Caminhos que apontam para a mesma pasta são
+    travados uma única vez.
+
+    Args:
+        folders (Iterable[Path]): As pastas a travar.
+        lock_dir (Optional[Path]): Onde criar os arquivos de trava.
+    """
+    locks: Dict[str, FolderLock] = {}
+    for folder in folders:
+        lock = FolderLock(folder, lock_dir)
+        locks.setdefault(lock.key, lock)
+    with ExitStack() as stack:
+        for key in sorted(locks, key=lambda key: Path(key).parts):
+            stack.enter_context(locks[key])
+        yield
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -9,6 +9,12 @@ class FileInfo:
     extension: str
     file_type: str
     size: int
+    modified_time: float = 0.0
+    duration_seconds: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    media_created_at: Optional[str] = None
 
 
 @dataclass
@@ -16,6 +22,9 @@ class OrganizationRequest:
     source_folder: str
     organize: bool = False
     create_folders: Optional[List[str]] = None
+    resume: bool = False
+    rules_file: Optional[str] = None
+    collision_strategy: str = "counter"
 
 
 @dataclass
@@ -28,6 +37,11 @@ class OrganizationResult:
     folders_created: List[str]
     files_found: List[FileInfo]
     errors: List[str]
+    renamed_files: int = 0
+    deduplicated_files: int = 0
+    moved_by_folder: Dict[str, int] = field(default_factory=dict)
+    images_remaining: int = 0
+    files_kept: int = 0
 
 
 @dataclass
@@ -39,3 +53,34 @@ class AnalysisResult:
     files_found: List[FileInfo]
     source_folder: str
     errors: List[str]
+
+
+@dataclass
+class StatisticsResult:
+    success: bool
+    message: str
+    total_files: int
+    statistics: Dict[str, Any]
+    source_folder: str
+    errors: List[str]
+
+
+@dataclass
+class SnapshotExportResult:
+    success: bool
+    message: str
+    source_folder: str
+    snapshot_path: str
+    total_entries: int
+    errors: List[str]
+
+
+@dataclass
+class SnapshotDiffResult:
+    success: bool
+    message: str
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+    moved: List[Dict[str, str]]
+    errors: List[str]
@@ -0,0 +1,165 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR_ENV = "PHOTO_ORGANIZER_CACHE_DIR"
+CACHE_MAGIC = b"POCACHE1"
+
+_HEADER = struct.Struct("<8sqQ")
+
+
+class ResultCache:
+    """
+    Cache de respostas serializadas, validado pelo mtime da pasta.
+
+    Cada pasta tem um arquivo de cache com cabeçalho (mtime da pasta em ns e
+    tamanho do conteúdo) seguido do JSON da resposta. Os arquivos são lidos
+    via mmap, então vários workers no mesmo host compartilham as páginas do
+    page cache em vez de manter cópias no heap; uma consulta válida custa um
+    stat da pasta e uma fatia do mapeamento.
+
+    O mtime de uma pasta só muda quando entradas são criadas, removidas ou
+    renomeadas nela; alterar o conteúdo de um arquivo existente não invalida
+    o cache. Como uma alteração no mesmo "tique" do relógio do sistema de
+    arquivos não muda o mtime, respostas de pastas alteradas há menos de
+    `granularity_ns` não são gravadas.
+
+    No máximo `max_mappings` arquivos ficam mapeados ao mesmo tempo (cada
+    mmap mantém um descritor aberto); os menos usados são fechados.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_mappings: int = 128,
+        granularity_ns: int = 2_000_000_000,
+    ):
+        """
+        Inicializa o ResultCache.
+
+        Args:
+            cache_dir (Optional[Path]): Pasta onde os caches são gravados.
+                Padrão: $PHOTO_ORGANIZER_CACHE_DIR ou a pasta temporária.
+            max_mappings (int): Quantidade máxima de arquivos mapeados.
+            granularity_ns (int): Idade mínima do mtime da pasta para que a
+                resposta possa ser gravada. O padrão cobre os 2 s do FAT.
+        """
+        if max_mappings < 1:
+            raise ValueError(f"Quantidade de mapeamentos inválida: {max_mappings}")
+        if cache_dir is None:
+            cache_dir = Path(
+                os.environ.get(CACHE_DIR_ENV)
+                or Path(tempfile.gettempdir()) / "photo_organizer_cache"
+            )
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_mappings = max_mappings
+        self.granularity_ns = granularity_ns
+        self._mappings: "OrderedDict[str, mmap.mmap]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def folder_version(folder: Path) -> Optional[int]:
+        try:
+            return folder.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _cache_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8", "surrogateescape")).hexdigest()
+        return self.cache_dir / f"{digest}.cache"
+
+    def _open_mapping(self, key: str) -> Optional[mmap.mmap]:
+        try:
+            with open(self._cache_path(key), "rb") as handle:
+                return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _read(mapping: mmap.mmap, version: int) -> Optional[bytes]:
+        if len(mapping) < _HEADER.size:
+            return None
+        magic, cached_version, length = _HEADER.unpack_from(mapping, 0)
+        if magic != CACHE_MAGIC or cached_version != version:
+            return None
+        if _HEADER.size + length > len(mapping):
+            return None
+        return mapping[_HEADER.size : _HEADER.size + length]
+
+    def get(self, key: str, folder: Path) -> Optional[bytes]:
+        """
+        Retorna a resposta em cache, se ainda for válida para a pasta.
+
+        Args:
+            key (str): A chave da resposta (normalmente o caminho da pasta).
+            folder (Path): A pasta cujo mtime valida o cache.
+
+        Returns:
+            Optional[bytes]: O conteúdo serializado ou None.
+        """
+        version = self.folder_version(folder)
+        if version is None:
+            return None
+
+        with self._lock:
+            mapping = self._mappings.get(key)
+            if mapping is not None:
+                self._mappings.move_to_end(key)
+                payload = self._read(mapping, version)
+                if payload is not None:
+                    return payload
+
+            # Mapeamento ausente ou antigo: outro worker pode ter gravado uma
+            # versão nova, então reabre o arquivo antes de desistir.
+            fresh = self._open_mapping(key)
+            if fresh is None:
+                return None
+            if mapping is not None:
+                mapping.close()
+            self._mappings[key] = fresh
+            self._mappings.move_to_end(key)
+            while len(self._mappings) > self.max_mappings:
+                _, evicted = self._mappings.popitem(last=False)
+                evicted.close()
+            return self._read(fresh, version)
+
+    def put(self, key: str, version: int, payload: bytes) -> bool:
+        """
+        Grava uma resposta no cache.
+
+        Args:
+            key (str): A chave da resposta.
+            version (int): O mtime da pasta (ns) obtido antes da varredura.
+            payload (bytes): O conteúdo serializado.
+
+        Returns:
+            bool: False se a pasta mudou recentemente demais para o mtime
+                  identificar a versão com segurança.
+        """
+        if time.time_ns() - version < self.granularity_ns:
+            return False
+        cache_path = self._cache_path(key)
+        fd, temp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_HEADER.pack(CACHE_MAGIC, version, len(payload)))
+                handle.write(payload)
+            os.replace(temp_name, cache_path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            for mapping in self._mappings.values():
+                mapping.close()
+            self._mappings.clear()
@@ -0,0 +1,328 @@
+import math
+import re
+import time
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .file_handler import FILE_TYPES, FileHandler, get_file_type
+
+SECONDS_PER_DAY = 86400
+
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+}
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?B?)\s*$", re.IGNORECASE)
+
+_RULE_KEYS = {
+    "name",
+    "folder",
+    "keep",
+    "extensions",
+    "types",
+    "min_size",
+    "max_size",
+    "older_than_days",
+    "newer_than_days",
+}
+
+
+def parse_size(value: Any) -> int:
+    """
+    Converte um tamanho (ex.: 2048, "500 MB", "2GB") para bytes.
+
+    Args:
+        value (Any): Um inteiro em bytes ou um texto com unidade.
+
+    Returns:
+        int: O tamanho em bytes.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Tamanho inválido: {value!r}")
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Tamanho inválido: {value!r}")
+    number, unit = match.groups()
+    unit = unit.upper()
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+@dataclass
+class OrganizationRule:
+    """
+    Regra declarativa de organização.
+
+    Todos os critérios informados precisam ser atendidos. Uma regra com
+    keep=True mantém o arquivo na pasta atual em vez de movê-lo.
+    """
+
+    folder: Optional[str] = None
+    name: str = ""
+    keep: bool = False
+    extensions: Optional[List[str]] = None
+    types: Optional[List[str]] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    older_than_days: Optional[float] = None
+    newer_than_days: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OrganizationRule":
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"Chave(s) desconhecida(s) na regra: {sorted(unknown)}")
+
+        rule = cls(
+            folder=data.get("folder"),
+            name=data.get("name", ""),
+            keep=data.get("keep", False),
+            extensions=data.get("extensions"),
+            types=data.get("types"),
+            min_size=(parse_size(data["min_size"]) if "min_size" in data else None),
+            max_size=(parse_size(data["max_size"]) if "max_size" in data else None),
+            older_than_days=data.get("older_than_days"),
+            newer_than_days=data.get("newer_than_days"),
+        )
+        rule.validate()
+        return rule
+
+    @property
+    def label(self) -> str:
+        for value in (self.name, self.folder):
+            if isinstance(value, str) and value:
+                return value
+        return "<sem nome>"
+
+    def validate(self) -> None:
+        """Valida os tipos e valores da regra e normaliza pasta e extensões."""
+        label = self.label
+        if not isinstance(self.name, str):
+            raise ValueError(f"Regra {label}: 'name' deve ser um texto")
+        if self.folder is not None and not isinstance(self.folder, str):
+            raise ValueError(f"Regra {label}: 'folder' deve ser um texto")
+        if not isinstance(self.keep, bool):
+            raise ValueError(f"Regra {label}: 'keep' deve ser true ou false")
+        for key in ("extensions", "types"):
+            values = getattr(self, key)
+            if values is not None and (
+                not isinstance(values, list)
+                or not all(isinstance(value, str) for value in values)
+            ):
+                raise ValueError(f"Regra {label}: '{key}' deve ser uma lista de textos")
+
+        if self.keep == bool(self.folder):
+            raise ValueError(f"Regra {label}: informe 'folder' ou 'keep = true'")
+        if self.folder:
+            # PurePosixPath descarta componentes "." e barras repetidas.
+            folder = PurePosixPath(self.folder)
+            if folder.is_absolute() or ".." in folder.parts:
+                raise ValueError(
+                    f"Regra {label}: a pasta deve ser relativa à pasta organizada"
+                )
+            if not folder.parts:
+                raise ValueError(
+                    f"Regra {label}: a pasta não pode ser a própria pasta organizada"
+                )
+            self.folder = folder.as_posix()
+        if self.extensions is not None:
+            self.extensions = [
+                ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+                for ext in self.extensions
+            ]
+        for days in (self.older_than_days, self.newer_than_days):
+            if days is not None and (
+                isinstance(days, bool) or not isinstance(days, (int, float))
+            ):
+                raise ValueError(f"Regra {label}: número de dias inválido {days!r}")
+        if (
+            self.min_size is not None
+            and self.max_size is not None
+            and self.min_size > self.max_size
+        ):
+            raise ValueError(f"Regra {label}: 'min_size' maior que 'max_size'")
+        if self.types is not None:
+            invalid = set(self.types) - set(FILE_TYPES)
+            if invalid:
+                raise ValueError(
+                    f"Regra {label}: tipo(s) inválido(s) {sorted(invalid)}"
+                )
+
+    def matches_key(self, extension: Optional[str], file_type: str) -> bool:
+        if self.extensions is not None and extension not in self.extensions:
+            return False
+        return self.types is None or file_type in self.types
+
+
+class CompiledRule:
+    """
+    Regra com limites numéricos pré-calculados.
+
+    Os critérios de idade são convertidos em limites absolutos de mtime no
+    momento da compilação, então a avaliação se resume a comparar tamanho e
+    mtime com intervalos semiabertos.
+    """
+
+    __slots__ = ("rule", "folder", "needs_stat", "bounds")
+
+    def __init__(self, rule: OrganizationRule, now: float):
+        self.rule = rule
+        self.folder: Optional[str] = None if rule.keep else rule.folder
+
+        min_size = rule.min_size if rule.min_size is not None else -math.inf
+        max_size = rule.max_size if rule.max_size is not None else math.inf
+        min_mtime = (
+            now - rule.newer_than_days * SECONDS_PER_DAY
+            if rule.newer_than_days is not None
+            else -math.inf
+        )
+        max_mtime = (
+            now - rule.older_than_days * SECONDS_PER_DAY
+            if rule.older_than_days is not None
+            else math.inf
+        )
+        self.bounds = (min_size, max_size, min_mtime, max_mtime)
+        self.needs_stat = self.bounds != (-math.inf, math.inf, -math.inf, math.inf)
+
+    def accepts(self, size: int, mtime: float) -> bool:
+        min_size, max_size, min_mtime, max_mtime = self.bounds
+        return min_size <= size < max_size and min_mtime <= mtime < max_mtime
+
+
+class RuleSet:
+    """
+    Conjunto de regras compilado em uma tabela de decisão indexada.
+
+    Na compilação, cada extensão citada em alguma regra recebe um balde com
+    apenas as regras que podem casar com ela (na ordem de declaração); os
+    demais arquivos caem no balde do seu tipo. Avaliar um arquivo custa uma
+    busca em dicionário e, no máximo, um stat seguido de comparações
+    numéricas sobre as poucas regras do balde. A primeira regra que casar
+    vence; sem correspondência, vale o mapeamento padrão do FileOrganizer.
+    """
+
+    def __init__(self, rules: Iterable[OrganizationRule], now: Optional[float] = None):
+        """
+        Inicializa e compila o RuleSet.
+
+        Args:
+            rules (Iterable[OrganizationRule]): As regras, em ordem de prioridade.
+            now (Optional[float]): Referência de tempo para as regras de idade.
+        """
+        self.rules = list(rules)
+        now = time.time() if now is None else now
+        compiled = [CompiledRule(rule, now) for rule in self.rules]
+
+        explicit_extensions = {
+            ext for rule in self.rules if rule.extensions for ext in rule.extensions
+        }
+        self._by_extension: Dict[str, Tuple[CompiledRule, ...]] = {
+            ext: self._build_bucket(
+                c for c in compiled if c.rule.matches_key(ext, get_file_type(ext))
+            )
+            for ext in explicit_extensions
+        }
+        # Balde por tipo: só regras sem filtro de extensão podem casar aqui,
+        # já que todas as extensões citadas têm balde próprio.
+        type_agnostic = [c for c in compiled if c.rule.extensions is None]
+        self._by_type: Dict[str, Tuple[CompiledRule, ...]] = {
+            file_type: self._build_bucket(
+                c for c in type_agnostic if c.rule.matches_key(None, file_type)
+            )
+            for file_type in FILE_TYPES
+        }
+
+    @staticmethod
+    def _build_bucket(candidates: Iterable[CompiledRule]) -> Tuple[CompiledRule, ...]:
+        bucket: List[CompiledRule] = []
+        for compiled in candidates:
+            bucket.append(compiled)
+            if not compiled.needs_stat:
+                # Regras depois de uma incondicional nunca seriam alcançadas.
+                break
+        return tuple(bucket)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, file: FileHandler) -> Optional[CompiledRule]:
+        """
+        Retorna a primeira regra que se aplica ao arquivo.
+
+        Args:
+            file (FileHandler): O arquivo a ser avaliado.
+
+        Returns:
+            Optional[CompiledRule]: A regra aplicável ou None.
+        """
+        bucket = self._by_extension.get(file.extension.lower())
+        if bucket is None:
+            bucket = self._by_type.get(file.type, ())
+
+        stat_result = None
+        for compiled in bucket:
+            if not compiled.needs_stat:
+                return compiled
+            if stat_result is None:
+                try:
+                    stat_result = file.path.stat()
+                except OSError:
+                    return None
+            if compiled.accepts(stat_result.st_size, stat_result.st_mtime):
+                return compiled
+        return None
+
+
+def load_rules(rules_path: Path, now: Optional[float] = None) -> RuleSet:
+    """
+    Carrega regras de um arquivo TOML ou YAML.
+
+    O arquivo deve conter uma lista "rules"; cada item aceita as chaves de
+    OrganizationRule. YAML exige o pacote PyYAML instalado.
+
+    Args:
+        rules_path (Path): O caminho para o arquivo de regras.
+        now (Optional[float]): Referência de tempo para as regras de idade.
+
+    Returns:
+        RuleSet: As regras compiladas.
+    """
+    suffix = rules_path.suffix.lower()
+    if suffix == ".toml":
+        with rules_path.open("rb") as handle:
+            try:
+                data = tomllib.load(handle)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"Arquivo de regras inválido: {e}") from e
+    elif suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError(
+                "Suporte a YAML requer o pacote PyYAML (pip install pyyaml)"
+            ) from e
+        with rules_path.open("r", encoding="utf-8") as handle:
+            try:
+                data = yaml.safe_load(handle) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(f"Arquivo de regras inválido: {e}") from e
+    else:
+        raise ValueError(f"Formato de arquivo de regras não suportado: {rules_path}")
+
+    raw_rules = data.get("rules") if isinstance(data, dict) else None
+    if not isinstance(raw_rules, list):
+        raise ValueError("O arquivo de regras deve conter uma lista 'rules'")
+
+    if not all(isinstance(item, dict) for item in raw_rules):
+        raise ValueError("Cada regra deve ser uma tabela de chaves e valores")
+
+    return RuleSet([OrganizationRule.from_dict(item) for item in raw_rules], now=now)
@@ -1,26 +1,57 @@
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from .analytics import ScanAnalytics
+from .checkpoint import OrganizationCheckpoint
 from .directory_scanner import DirectoryScanner
 from .file_handler import FileHandler
 from .file_organizer import FileOrganizer
-from .models import AnalysisResult, FileInfo, OrganizationRequest, OrganizationResult
+from .folder_lock import FolderLock, lock_key
+from .models import (
+    AnalysisResult,
+    FileInfo,
+    OrganizationRequest,
+    OrganizationResult,
+    SnapshotDiffResult,
+    SnapshotExportResult,
+    StatisticsResult,
+)
+from .rules import load_rules
+from .snapshot import diff_snapshots, write_snapshot
+from .video_metadata import PARSEABLE_VIDEO_EXTENSIONS, VideoMetadataExtractor
+
+# Organizações em andamento neste processo, por (pasta, regras, colisão).
+_running_jobs: Dict[Tuple[str, Optional[str], str], Future] = {}
+_running_jobs_lock = threading.Lock()
 
 
 class PhotoOrganizerService:
 
-    def _convert_to_file_info(self, files: List[FileHandler]) -> List[FileInfo]:
+    def __init__(
+        self,
+        video_extractor: Optional[VideoMetadataExtractor] = None,
+        lock_dir: Optional[Path] = None,
+    ):
+        self.video_extractor = video_extractor or VideoMetadataExtractor()
+        self.lock_dir = lock_dir
+
+    def _convert_to_file_info(
+        self, files: List[FileHandler], include_video_metadata: bool = False
+    ) -> List[FileInfo]:
         files_info = []
         for file in files:
             try:
-                size = file.path.stat().st_size if file.path.exists() else 0
+                stat_result = file.path.stat()
                 files_info.append(
                     FileInfo(
                         name=file.name,
                         path=str(file.path),
                         extension=file.extension,
                         file_type=file.type,
-                        size=size,
+                        size=stat_result.st_size,
+                        modified_time=stat_result.st_mtime,
                     )
                 )
             except (OSError, AttributeError):
@@ -33,43 +64,71 @@ class PhotoOrganizerService:
                         size=0,
                     )
                 )
+        if include_video_metadata:
+            self._add_video_metadata(files_info)
         return files_info
 
+    def _add_video_metadata(self, files_info: List[FileInfo]) -> None:
+        videos = [
+            info
+            for info in files_info
+            if info.file_type == "Vídeo"
+            and info.extension.lower() in PARSEABLE_VIDEO_EXTENSIONS
+        ]
+        if not videos:
+            return
+        metadata_by_path = self.video_extractor.extract_many(
+            info.path for info in videos
+        )
+        for info in videos:
+            metadata = metadata_by_path.get(info.path)
+            if metadata is not None:
+                info.duration_seconds = metadata.duration_seconds
+                info.width = metadata.width
+                info.height = metadata.height
+                info.video_codec = metadata.codec
+                info.media_created_at = metadata.created_at
+
     def _group_files_count_by_type(self, files: List[FileHandler]) -> Dict[str, int]:
         counts: Dict[str, int] = {}
         for file in files:
             counts[file.type] = counts.get(file.type, 0) + 1
         return counts
 
-    def analyze_folder(self, folder_path: str) -> AnalysisResult:
+    def _folder_error(self, source_path: Path) -> Optional[str]:
+        if not source_path.exists():
+            return f"Pasta não encontrada: {source_path}"
+        if not source_path.is_dir():
+            return f"Caminho não é uma pasta: {source_path}"
+        return None
+
+    def analyze_folder(
+        self, folder_path: str, include_video_metadata: bool = False
+    ) -> AnalysisResult:
+        """
+        Analisa a pasta sem alterar nada.
+
+        Com include_video_metadata, os cabeçalhos dos vídeos MP4/MOV também
+        são lidos para preencher duração, resolução, codec e data de criação.
+        """
         try:
             source_path = Path(folder_path).expanduser().resolve()
-            if not source_path.exists():
+            error = self._folder_error(source_path)
+            if error:
                 return AnalysisResult(
                     success=False,
-                    message=f"Pasta não encontrada: {source_path}",
+                    message=error,
                     total_files=0,
                     files_by_type={},
                     files_found=[],
                     source_folder=str(source_path),
-                    errors=[f"Pasta não encontrada: {source_path}"],
-                )
-
-            if not source_path.is_dir():
-                return AnalysisResult(
-                    success=False,
-                    message=f"Caminho não é uma pasta: {source_path}",
-                    total_files=0,
-                    files_by_type={},
-                    files_found=[],
-                    source_folder=str(source_path),
-                    errors=[f"Caminho não é uma pasta: {source_path}"],
+                    errors=[error],
                 )
 
             scanner = DirectoryScanner(source_path)
             files = scanner.scan_files()
 
-            files_info = self._convert_to_file_info(files)
+            files_info = self._convert_to_file_info(files, include_video_metadata)
 
             files_by_type = self._group_files_count_by_type(files)
 
@@ -94,25 +153,168 @@ class PhotoOrganizerService:
                 errors=[str(e)],
             )
 
+    def analyze_statistics(self, folder_path: str, top_n: int = 10) -> StatisticsResult:
+        analysis = self.analyze_folder(folder_path)
+        if not analysis.success:
+            return StatisticsResult(
+                success=False,
+                message=analysis.message,
+                total_files=0,
+                statistics={},
+                source_folder=analysis.source_folder,
+                errors=analysis.errors,
+            )
+
+        statistics = ScanAnalytics(analysis.files_found).compute(top_n=top_n)
+
+        return StatisticsResult(
+            success=True,
+            message=f"Estatísticas calculadas para {analysis.total_files} arquivo(s).",
+            total_files=analysis.total_files,
+            statistics=statistics,
+            source_folder=analysis.source_folder,
+            errors=[],
+        )
+
+    def export_snapshot(
+        self, folder_path: str, output_path: str, with_hash: bool = False
+    ) -> SnapshotExportResult:
+        source_path = Path(folder_path).expanduser().resolve()
+        snapshot_path = Path(output_path).expanduser().resolve()
+        try:
+            total_entries = write_snapshot(source_path, snapshot_path, with_hash)
+            return SnapshotExportResult(
+                success=True,
+                message=f"Snapshot gravado com {total_entries} arquivo(s).",
+                source_folder=str(source_path),
+                snapshot_path=str(snapshot_path),
+                total_entries=total_entries,
+                errors=[],
+            )
+        except (OSError, ValueError) as e:
+            return SnapshotExportResult(
+                success=False,
+                message=f"Erro ao gravar snapshot: {str(e)}",
+                source_folder=str(source_path),
+                snapshot_path=str(snapshot_path),
+                total_entries=0,
+                errors=[str(e)],
+            )
+
+    def diff_snapshots(
+        self, old_snapshot: str, new_snapshot: str
+    ) -> SnapshotDiffResult:
+        changes: Dict[str, List[str]] = {"added": [], "removed": [], "modified": []}
+        moved: List[Dict[str, str]] = []
+        try:
+            for change in diff_snapshots(
+                Path(old_snapshot).expanduser(), Path(new_snapshot).expanduser()
+            ):
+                if change.kind == "moved":
+                    moved.append({"from": change.old_path, "to": change.path})
+                else:
+                    changes[change.kind].append(change.path)
+        except (OSError, ValueError) as e:
+            return SnapshotDiffResult(
+                success=False,
+                message=f"Erro ao comparar snapshots: {str(e)}",
+                added=[],
+                removed=[],
+                modified=[],
+                moved=[],
+                errors=[str(e)],
+            )
+
+        total_changes = sum(len(paths) for paths in changes.values()) + len(moved)
+        return SnapshotDiffResult(
+            success=True,
+            message=f"Comparação concluída. {total_changes} alteração(ões) encontrada(s).",
+            added=changes["added"],
+            removed=changes["removed"],
+            modified=changes["modified"],
+            moved=moved,
+            errors=[],
+        )
+
     def organize_files(self, request: OrganizationRequest) -> OrganizationResult:
+        """
+        Organiza a pasta, com exclusão mútua por pasta.
+
+        A análise (organize=False) não usa travas. Para organizar, a pasta de
+        origem é travada com FolderLock e os destinos pelo FileOrganizer;
+        pedidos idênticos para a mesma pasta feitos neste processo enquanto
+        um job roda aguardam e recebem o resultado desse job. Jobs de outros
+        processos esperam a trava e então encontram a pasta já organizada.
+        """
+        if not request.organize:
+            return self._organize_files(request)
+
+        source_path = Path(request.source_folder).expanduser().resolve()
+        # Mesma chave canônica das travas, para que variações do caminho
+        # (maiúsculas, links) compartilhem o job em andamento.
+        job_key = (
+            lock_key(source_path),
+            request.rules_file,
+            request.collision_strategy,
+        )
+
+        with _running_jobs_lock:
+            running = _running_jobs.get(job_key)
+            if running is None:
+                job: Future = Future()
+                _running_jobs[job_key] = job
+        if running is not None:
+            return running.result()
 
         try:
-            analysis = self.analyze_folder(request.source_folder)
-            if not analysis.success:
-                return OrganizationResult(
-                    success=False,
-                    message=analysis.message,
-                    total_files=0,
-                    files_by_type={},
-                    moved_files={},
-                    folders_created=[],
-                    files_found=[],
-                    errors=analysis.errors,
-                )
+            result = self._organize_locked(request, source_path)
+            job.set_result(result)
+            return result
+        except BaseException as e:
+            job.set_exception(e)
+            raise
+        finally:
+            with _running_jobs_lock:
+                del _running_jobs[job_key]
 
-            source_path = Path(request.source_folder).expanduser().resolve()
+    def _organize_locked(
+        self, request: OrganizationRequest, source_path: Path
+    ) -> OrganizationResult:
+        lock = FolderLock(source_path, self.lock_dir)
+        try:
+            lock.acquire()
+        except OSError as e:
+            return OrganizationResult(
+                success=False,
+                message=f"Erro ao travar a pasta: {str(e)}",
+                total_files=0,
+                files_by_type={},
+                moved_files={},
+                folders_created=[],
+                files_found=[],
+                errors=[str(e)],
+            )
+        try:
+            return self._organize_files(request)
+        finally:
+            lock.release()
 
+    def _organize_files(self, request: OrganizationRequest) -> OrganizationResult:
+
+        try:
             if not request.organize:
+                analysis = self.analyze_folder(request.source_folder)
+                if not analysis.success:
+                    return OrganizationResult(
+                        success=False,
+                        message=analysis.message,
+                        total_files=0,
+                        files_by_type={},
+                        moved_files={},
+                        folders_created=[],
+                        files_found=[],
+                        errors=analysis.errors,
+                    )
                 return OrganizationResult(
                     success=True,
                     message="Análise concluída. Use organize=True para organizar os arquivos.",
@@ -124,23 +326,78 @@ class PhotoOrganizerService:
                     errors=[],
                 )
 
+            source_path = Path(request.source_folder).expanduser().resolve()
+            error = self._folder_error(source_path)
+            if error:
+                return OrganizationResult(
+                    success=False,
+                    message=error,
+                    total_files=0,
+                    files_by_type={},
+                    moved_files={},
+                    folders_created=[],
+                    files_found=[],
+                    errors=[error],
+                )
+
+            rules = (
+                load_rules(Path(request.rules_file).expanduser())
+                if request.rules_file
+                else None
+            )
+
+            # Uma única varredura serve tanto para organizar quanto para os totais.
             scanner = DirectoryScanner(source_path)
             files = scanner.scan_files()
+            files_by_type = self._group_files_count_by_type(files)
 
-            organizer = FileOrganizer(source_path)
-            moved_files = organizer.organize_files(files)
+            checkpoint = OrganizationCheckpoint(source_path)
+            if request.resume:
+                checkpoint.load()
+            previously_removed = dict(checkpoint.removed_files)
+
+            organizer = FileOrganizer(
+                source_path,
+                rules,
+                request.collision_strategy,
+                lock_targets=True,
+                lock_dir=self.lock_dir,
+            )
+            organizer.organize_files(files, checkpoint)
+            checkpoint.clear()
 
             files_info = self._convert_to_file_info(files)
 
+            # Arquivos movidos ou removidos como duplicados em segmentos
+            # anteriores já não estão na pasta, então entram nos totais a
+            # partir do checkpoint.
+            for file_type, count in previously_removed.items():
+                files_by_type[file_type] = files_by_type.get(file_type, 0) + count
+            moved_files = checkpoint.moved_files
+            total_moved = sum(moved_files.values())
+
+            deduplicated = checkpoint.outcomes.get("deduplicated", 0)
+
+            message = f"Organização concluída! {total_moved} arquivo(s) movido(s)."
+            if deduplicated:
+                message += f" {deduplicated} duplicado(s) removido(s)."
+            if checkpoint.resumed:
+                message += f" Retomada após {checkpoint.segments} execução(ões) interrompida(s)."
+
             return OrganizationResult(
                 success=True,
-                message=f"Organização concluída! {sum(moved_files.values())} arquivo(s) movido(s).",
-                total_files=len(files),
-                files_by_type=analysis.files_by_type,
+                message=message,
+                total_files=len(files) + sum(previously_removed.values()),
+                files_by_type=files_by_type,
                 moved_files=moved_files,
-                folders_created=organizer.folders_created,
+                folders_created=checkpoint.folders_created,
                 files_found=files_info,
                 errors=[],
+                renamed_files=checkpoint.outcomes.get("renamed", 0),
+                deduplicated_files=deduplicated,
+                moved_by_folder=checkpoint.moved_by_folder,
+                images_remaining=organizer.images_remaining_count,
+                files_kept=organizer.files_kept_count,
             )
 
         except (OSError, ValueError) as e:
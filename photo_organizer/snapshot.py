@@ -0,0 +1,266 @@
+import hashlib
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .directory_scanner import IGNORED_FILE_NAMES
+
+SNAPSHOT_MAGIC = b"POSNAP"
+SNAPSHOT_VERSION = 1
+FLAG_HAS_HASH = 0x01
+HASH_SIZE = 16
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_HEADER = struct.Struct("<6sBB")
+_PATH_LENGTH = struct.Struct("<H")
+_FIELDS = struct.Struct("<QqQ")
+
+
+class SnapshotEntry(NamedTuple):
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+    digest: Optional[bytes] = None
+
+
+@dataclass
+class SnapshotChange:
+    kind: str
+    path: str
+    old_path: Optional[str] = None
+
+
+def _sort_key(path: str) -> str:
+    # Com "/" trocado por "\0", a ordem de texto coincide com a de uma busca
+    # em profundidade que visita as entradas de cada pasta em ordem de nome.
+    return path.replace("/", "\0")
+
+
+def _file_digest(path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=HASH_SIZE)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _walk_sorted(
+    root: str, prefix: str, skip: FrozenSet[str]
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    try:
+        with os.scandir(root) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        # Subpasta removida ou ilegível durante a varredura: fica de fora,
+        # assim como arquivos que somem no DirectoryScanner.
+        if not prefix:
+            raise
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_sorted(entry.path, f"{prefix}{entry.name}/", skip)
+        elif (
+            entry.is_file(follow_symlinks=False)
+            and entry.name not in IGNORED_FILE_NAMES
+            and entry.path not in skip
+        ):
+            yield prefix, entry
+
+
+def write_snapshot(
+    source_folder: Path, output_path: Path, with_hash: bool = False
+) -> int:
+    """
+    Grava um snapshot binário e ordenado de todos os arquivos de uma pasta.
+
+    A pasta é percorrida recursivamente em ordem de nome, então as entradas
+    já saem ordenadas e só uma pasta por vez precisa ficar em memória. Cada
+    registro guarda caminho relativo, tamanho, mtime (ns), inode e,
+    opcionalmente, um hash BLAKE2b de 16 bytes do conteúdo. Arquivos que
+    somem durante a varredura e subpastas ilegíveis ficam de fora; se a
+    gravação falhar, o arquivo temporário é removido.
+
+    Args:
+        source_folder (Path): A pasta a ser registrada.
+        output_path (Path): O arquivo de snapshot a ser criado.
+        with_hash (bool): Se o hash do conteúdo deve ser calculado.
+
+    Returns:
+        int: A quantidade de entradas gravadas.
+    """
+    if not source_folder.is_dir():
+        raise ValueError(f"O caminho fornecido não é um diretório: {source_folder}")
+
+    flags = FLAG_HAS_HASH if with_hash else 0
+    temp_path = output_path.with_name(output_path.name + ".tmp")
+    skip = frozenset({str(output_path.resolve()), str(temp_path.resolve())})
+    count = 0
+    try:
+        with open(temp_path, "wb") as handle:
+            handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags))
+            for prefix, entry in _walk_sorted(str(source_folder.resolve()), "", skip):
+                try:
+                    stat_result = entry.stat(follow_symlinks=False)
+                    digest = _file_digest(entry.path) if with_hash else b""
+                except FileNotFoundError:
+                    continue
+                encoded = f"{prefix}{entry.name}".encode("utf-8", "surrogateescape")
+                handle.write(_PATH_LENGTH.pack(len(encoded)))
+                handle.write(encoded)
+                handle.write(
+                    _FIELDS.pack(
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                        stat_result.st_ino,
+                    )
+                )
+                handle.write(digest)
+                count += 1
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def _read_exact(handle: BinaryIO, size: int) -> bytes:
+    data = handle.read(size)
+    if len(data) != size:
+        raise ValueError("Snapshot truncado ou corrompido")
+    return data
+
+
+def iter_snapshot(snapshot_path: Path) -> Iterator[SnapshotEntry]:
+    """
+    Lê as entradas de um snapshot em fluxo, sem carregá-lo inteiro.
+
+    Args:
+        snapshot_path (Path): O arquivo de snapshot.
+
+    Returns:
+        Iterator[SnapshotEntry]: As entradas, na ordem gravada.
+    """
+    with open(snapshot_path, "rb", buffering=HASH_CHUNK_SIZE) as handle:
+        header = handle.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Arquivo não é um snapshot: {snapshot_path}")
+        magic, version, flags = _HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Arquivo não é um snapshot: {snapshot_path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Versão de snapshot não suportada: {version}")
+        has_hash = bool(flags & FLAG_HAS_HASH)
+
+        while length_bytes := handle.read(_PATH_LENGTH.size):
+            if len(length_bytes) != _PATH_LENGTH.size:
+                raise ValueError("Snapshot truncado ou corrompido")
+            (length,) = _PATH_LENGTH.unpack(length_bytes)
+            path = _read_exact(handle, length).decode("utf-8", "surrogateescape")
+            size, mtime_ns, inode = _FIELDS.unpack(_read_exact(handle, _FIELDS.size))
+            digest = _read_exact(handle, HASH_SIZE) if has_hash else None
+            yield SnapshotEntry(path, size, mtime_ns, inode, digest)
+
+
+def _is_modified(old: SnapshotEntry, new: SnapshotEntry) -> bool:
+    if old.digest is not None and new.digest is not None:
+        return old.digest != new.digest
+    return old.size != new.size or old.mtime_ns != new.mtime_ns
+
+
+def _take_removed(
+    candidates: Optional[List[str]], removed: Dict[str, SnapshotEntry]
+) -> Optional[str]:
+    while candidates:
+        path = candidates.pop()
+        if path in removed:
+            return path
+    return None
+
+
+def diff_snapshots(old_path: Path, new_path: Path) -> Iterator[SnapshotChange]:
+    """
+    Compara dois snapshots com um merge-join em fluxo, em tempo O(n).
+
+    Alterações de conteúdo são emitidas durante a leitura. Entradas que só
+    existem de um lado ficam pendentes até o fim, quando são pareadas como
+    movidas (mesmo inode e tamanho, ou mesmo hash de conteúdo); as que
+    sobram viram adicionadas ou removidas. Cada entrada removida é pareada
+    no máximo uma vez, então várias cópias idênticas movidas juntas geram
+    uma movimentação para cada. O pareamento por inode não guarda o
+    dispositivo e supõe que a pasta fica em um único sistema de arquivos.
+    A memória usada cresce com o número de alterações, não com o tamanho
+    dos snapshots.
+
+    Args:
+        old_path (Path): O snapshot anterior.
+        new_path (Path): O snapshot mais recente.
+
+    Returns:
+        Iterator[SnapshotChange]: As alterações encontradas.
+    """
+    old_entries = iter_snapshot(old_path)
+    new_entries = iter_snapshot(new_path)
+    removed: Dict[str, SnapshotEntry] = {}
+    added: List[SnapshotEntry] = []
+
+    old = next(old_entries, None)
+    new = next(new_entries, None)
+    while old is not None and new is not None:
+        old_key, new_key = _sort_key(old.path), _sort_key(new.path)
+        if old_key == new_key:
+            if _is_modified(old, new):
+                yield SnapshotChange("modified", new.path)
+            old = next(old_entries, None)
+            new = next(new_entries, None)
+        elif old_key < new_key:
+            removed[old.path] = old
+            old = next(old_entries, None)
+        else:
+            added.append(new)
+            new = next(new_entries, None)
+    while old is not None:
+        removed[old.path] = old
+        old = next(old_entries, None)
+    while new is not None:
+        added.append(new)
+        new = next(new_entries, None)
+
+    # Listas em ordem reversa, para que pop() devolva o primeiro candidato.
+    by_inode: Dict[Tuple[int, int], List[str]] = {}
+    by_digest: Dict[bytes, List[str]] = {}
+    for path, entry in reversed(removed.items()):
+        if entry.inode:
+            by_inode.setdefault((entry.inode, entry.size), []).append(path)
+        if entry.digest:
+            by_digest.setdefault(entry.digest, []).append(path)
+    unmatched: List[SnapshotEntry] = []
+    for entry in added:
+        old_path_match = None
+        if entry.inode:
+            old_path_match = _take_removed(
+                by_inode.get((entry.inode, entry.size)), removed
+            )
+        if old_path_match is None and entry.digest:
+            old_path_match = _take_removed(by_digest.get(entry.digest), removed)
+        if old_path_match is not None:
+            del removed[old_path_match]
+            yield SnapshotChange("moved", entry.path, old_path=old_path_match)
+        else:
+            unmatched.append(entry)
+
+    for path in removed:
+        yield SnapshotChange("removed", path)
+    for entry in unmatched:
+        yield SnapshotChange("added", entry.path)
@@ -0,0 +1,194 @@
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Extensões em contêiner ISO BMFF (MP4/QuickTime) que sabemos ler.
+PARSEABLE_VIDEO_EXTENSIONS = frozenset({".mp4", ".mov"})
+
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+_BOX_HEADER = struct.Struct(">I4s")
+_LARGE_SIZE = struct.Struct(">Q")
+
+StatKey = Tuple[str, int, int, int]
+
+
+@dataclass
+class VideoMetadata:
+    duration_seconds: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    codec: Optional[str] = None
+    created_at: Optional[str] = None
+
+
+def _iter_boxes(data, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Percorre as caixas em data[start:end], devolvendo (tipo, início, fim)."""
+    offset = start
+    while offset + _BOX_HEADER.size <= end:
+        size, box_type = _BOX_HEADER.unpack_from(data, offset)
+        header_size = _BOX_HEADER.size
+        if size == 1:
+            if offset + 16 > end:
+                return
+            (size,) = _LARGE_SIZE.unpack_from(data, offset + 8)
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            return
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _find_box(data, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found_type, payload_start, box_end in _iter_boxes(data, start, end):
+        if found_type == box_type:
+            return payload_start, box_end
+    return None
+
+
+def _find_path(data, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    span: Optional[Tuple[int, int]] = (start, end)
+    for box_type in path:
+        span = _find_box(data, span[0], span[1], box_type)
+        if span is None:
+            return None
+    return span
+
+
+def _parse_mvhd(data, start: int, end: int, metadata: VideoMetadata) -> None:
+    if start >= end:
+        return
+    version = data[start]
+    if version == 1:
+        if start + 32 > end:
+            return
+        creation, _, timescale, duration = struct.unpack_from(">QQIQ", data, start + 4)
+    elif start + 20 <= end:
+        creation, _, timescale, duration = struct.unpack_from(">IIII", data, start + 4)
+    else:
+        return
+    if timescale:
+        metadata.duration_seconds = round(duration / timescale, 3)
+    if creation:
+        try:
+            created = _MP4_EPOCH + timedelta(seconds=creation)
+        except OverflowError:
+            # Data fora do intervalo do datetime: cabeçalho corrompido.
+            return
+        metadata.created_at = created.isoformat()
+
+
+def _parse_video_track(data, start: int, end: int, metadata: VideoMetadata) -> bool:
+    handler = _find_path(data, start, end, b"mdia", b"hdlr")
+    if handler is None or handler[0] + 12 > handler[1]:
+        return False
+    if data[handler[0] + 8 : handler[0] + 12] != b"vide":
+        return False
+
+    tkhd = _find_box(data, start, end, b"tkhd")
+    if tkhd is not None and tkhd[0] < tkhd[1]:
+        size_offset = tkhd[0] + (88 if data[tkhd[0]] == 1 else 76)
+        if size_offset + 8 <= tkhd[1]:
+            width, height = struct.unpack_from(">II", data, size_offset)
+            metadata.width = width >> 16
+            metadata.height = height >> 16
+
+    stsd = _find_path(data, start, end, b"mdia", b"minf", b"stbl", b"stsd")
+    if stsd is not None and stsd[0] + 16 <= stsd[1]:
+        codec = bytes(data[stsd[0] + 12 : stsd[0] + 16])
+        metadata.codec = codec.decode("latin-1").strip()
+    return True
+
+
+def read_video_metadata(path: str) -> Optional[VideoMetadata]:
+    """
+    Lê duração, resolução, codec e data de criação de um MP4/MOV.
+
+    Só os cabeçalhos são lidos: o arquivo é mapeado em memória e apenas as
+    caixas moov/mvhd/trak/tkhd/hdlr/stsd são visitadas, então as páginas
+    de mídia (mdat) nunca são carregadas.
+
+    Args:
+        path (str): O caminho para o arquivo de vídeo.
+
+    Returns:
+        Optional[VideoMetadata]: Os metadados, ou None se o arquivo não for
+                                 um contêiner ISO BMFF válido.
+    """
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _BOX_HEADER.size:
+                return None
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                moov = _find_box(data, 0, len(data), b"moov")
+                if moov is None:
+                    return None
+                metadata = VideoMetadata()
+                mvhd = _find_box(data, moov[0], moov[1], b"mvhd")
+                if mvhd is not None:
+                    _parse_mvhd(data, mvhd[0], mvhd[1], metadata)
+                for box_type, start, end in _iter_boxes(data, moov[0], moov[1]):
+                    if box_type == b"trak" and _parse_video_track(
+                        data, start, end, metadata
+                    ):
+                        break
+                return metadata
+    except (OSError, ValueError, OverflowError, IndexError, struct.error):
+        return None
+
+
+class VideoMetadataExtractor:
+    """
+    Extrai metadados de vídeos em paralelo, com cache por chave de stat.
+
+    A chave (caminho, tamanho, mtime, inode) garante que um arquivo alterado
+    seja relido, enquanto consultas repetidas ao mesmo arquivo custam apenas
+    um stat.
+    """
+
+    def __init__(self, max_workers: int = 8, cache_size: int = 10000):
+        """
+        Inicializa o VideoMetadataExtractor.
+
+        Args:
+            max_workers (int): Número de threads de leitura.
+            cache_size (int): Quantidade máxima de entradas em cache.
+        """
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[StatKey, Optional[VideoMetadata]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def extract(self, path: str) -> Optional[VideoMetadata]:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        metadata = read_video_metadata(path)
+
+        with self._lock:
+            self._cache[key] = metadata
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return metadata
+
+    def extract_many(self, paths: Iterable[str]) -> Dict[str, Optional[VideoMetadata]]:
+        paths = list(paths)
+        if len(paths) <= 1 or self.max_workers <= 1:
+            return {path: self.extract(path) for path in paths}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(paths, executor.map(self.extract, paths)))
@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timezone
+
+from photo_organizer.analytics import ScanAnalytics
+from photo_organizer.models import FileInfo
+
+
+def _timestamp(year: int, month: int) -> float:
+    return datetime(year, month, 15, tzinfo=timezone.utc).timestamp()
+
+
+class TestScanAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.files = [
+            FileInfo("a.jpg", "/f/a.jpg", ".jpg", "Imagem", 500, _timestamp(2024, 1)),
+            FileInfo("b.JPG", "/f/b.JPG", ".JPG", "Imagem", 2048, _timestamp(2024, 1)),
+            FileInfo(
+                "c.mp4", "/f/c.mp4", ".mp4", "Vídeo", 5 * 1024**2, _timestamp(2024, 3)
+            ),
+            FileInfo("d.txt", "/f/d.txt", ".txt", "Texto", 10, _timestamp(2023, 12)),
+            FileInfo("LEIAME", "/f/LEIAME", "", "Outro", 0),
+        ]
+
+    def test_compute_aggregates(self):
+        stats = ScanAnalytics(self.files).compute(top_n=2)
+
+        self.assertEqual(stats["total_files"], 5)
+        self.assertEqual(stats["total_bytes"], 500 + 2048 + 5 * 1024**2 + 10)
+        self.assertEqual(stats["size_histogram"]["< 1 KB"], 3)
+        self.assertEqual(stats["size_histogram"]["1 KB - 1 MB"], 1)
+        self.assertEqual(stats["size_histogram"]["1 MB - 10 MB"], 1)
+        self.assertEqual(stats["by_type"]["Imagem"], {"count": 2, "bytes": 2548})
+        self.assertEqual(
+            [f["name"] for f in stats["largest_files"]], ["c.mp4", "b.JPG"]
+        )
+
+    def test_extension_and_month_distributions(self):
+        stats = ScanAnalytics(self.files).compute()
+
+        jpg = stats["by_extension"][".jpg"]
+        self.assertEqual(jpg["count"], 2)
+        self.assertEqual(jpg["min_size"], 500)
+        self.assertEqual(jpg["max_size"], 2048)
+        self.assertEqual(jpg["mean_size"], 1274.0)
+        self.assertIn("(sem extensão)", stats["by_extension"])
+
+        self.assertEqual(
+            stats["by_month"],
+            {
+                "2023-12": {"count": 1, "bytes": 10},
+                "2024-01": {"count": 2, "bytes": 2548},
+                "2024-03": {"count": 1, "bytes": 5 * 1024**2},
+            },
+        )
+
+    def test_compute_with_no_files(self):
+        stats = ScanAnalytics([]).compute()
+
+        self.assertEqual(stats["total_files"], 0)
+        self.assertEqual(stats["largest_files"], [])
+        self.assertEqual(stats["by_extension"], {})
+        self.assertEqual(stats["by_month"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import errno
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from photo_organizer import collision_resolver
+from photo_organizer.collision_resolver import (
+    CollisionResolver,
+    move_without_replacing,
+)
+
+
+class TestCollisionResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir)
+        self.target = self.base_path / "Textos"
+        self.target.mkdir()
+        (self.target / "nota.txt").write_text("original")
+        (self.target / "nota (1).txt").write_text("primeira cópia")
+
+    def test_resolve_generates_counter_names_without_exists(self):
+        resolver = CollisionResolver(self.target)
+        source = self.base_path / "nota.txt"
+        source.write_text("outra versão")
+        fresh = self.base_path / "nova.txt"
+        fresh.write_text("nova")
+
+        with mock.patch.object(Path, "exists", side_effect=AssertionError):
+            first = resolver.resolve(source)
+            (self.target / first.target_name).write_text("outra versão")
+            resolver.register(first.target_name)
+            second = resolver.resolve(source)
+            untouched = resolver.resolve(fresh)
+
+        self.assertEqual(first.target_name, "nota (2).txt")
+        self.assertTrue(first.renamed)
+        self.assertEqual(second.target_name, "nota (2).txt")
+        self.assertTrue(second.duplicate)
+        self.assertEqual(untouched.target_name, "nova.txt")
+        self.assertFalse(untouched.renamed)
+
+    def test_resolve_detects_identical_variant(self):
+        resolver = CollisionResolver(self.target)
+        source = self.base_path / "nota.txt"
+        source.write_text("primeira cópia")
+
+        decision = resolver.resolve(source)
+
+        self.assertTrue(decision.duplicate)
+        self.assertEqual(decision.target_name, "nota (1).txt")
+
+    def test_resolve_with_hash_strategy(self):
+        resolver = CollisionResolver(self.target, strategy="hash")
+        source = self.base_path / "nota.txt"
+        source.write_text("conteúdo diferente")
+
+        decision = resolver.resolve(source)
+
+        self.assertTrue(decision.renamed)
+        self.assertRegex(decision.target_name, r"^nota-[0-9a-f]{8}\.txt$")
+        with self.assertRaises(ValueError):
+            CollisionResolver(self.target, strategy="sobrescrever")
+
+    def test_source_inside_target_is_never_its_own_duplicate(self):
+        resolver = CollisionResolver(self.target)
+
+        decision = resolver.resolve(self.target / "nota.txt")
+
+        self.assertFalse(decision.duplicate)
+        self.assertEqual(
+            (self.target / "nota.txt").read_text(encoding="utf-8"), "original"
+        )
+
+    def test_move_never_replaces_name_missing_from_memory(self):
+        resolver = CollisionResolver(self.target)
+        self.assertFalse(resolver.case_insensitive)
+        # Criado depois da leitura dos nomes, como por outro processo.
+        (self.target / "nova.txt").write_text("de outro processo")
+        source = self.base_path / "nova.txt"
+        source.write_text("local")
+
+        decision = resolver.move(source)
+
+        self.assertEqual(decision.target_name, "nova (1).txt")
+        self.assertEqual((self.target / "nova.txt").read_text(), "de outro processo")
+        self.assertEqual((self.target / "nova (1).txt").read_text(), "local")
+        self.assertFalse(source.exists())
+
+    def test_case_insensitive_names_collide(self):
+        source = self.base_path / "NOTA.txt"
+        source.write_text("outra caixa")
+
+        with mock.patch.object(
+            collision_resolver, "is_case_insensitive", return_value=True
+        ):
+            resolver = CollisionResolver(self.target)
+            decision = resolver.resolve(source)
+
+        self.assertTrue(decision.renamed)
+        self.assertEqual(decision.target_name, "NOTA (2).txt")
+
+    def test_move_without_link_support_reserves_the_name(self):
+        source = self.base_path / "nota.txt"
+        source.write_text("outra versão")
+        fresh = self.base_path / "nova.txt"
+        fresh.write_text("nova")
+
+        with mock.patch.object(
+            os, "link", side_effect=OSError(errno.EXDEV, "outro dispositivo")
+        ):
+            with self.assertRaises(FileExistsError):
+                move_without_replacing(source, self.target / "nota.txt")
+            move_without_replacing(fresh, self.target / "nova.txt")
+
+        self.assertEqual((self.target / "nota.txt").read_text(), "original")
+        self.assertTrue(source.exists())
+        self.assertEqual((self.target / "nova.txt").read_text(), "nova")
+        self.assertFalse(fresh.exists())
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from photo_organizer.checkpoint import OrganizationCheckpoint
+from photo_organizer.collision_resolver import CollisionResolver
 from photo_organizer.file_handler import FileHandler
 from photo_organizer.file_organizer import FileOrganizer
 
@@ -67,9 +71,56 @@ class TestFileOrganizer(unittest.TestCase):
 
         self.assertTrue(self.test_files[0].exists())
 
-    def tearDown(self):
-        import shutil
+    def test_organize_files_saves_checkpoint_when_interrupted(self):
+        files = [FileHandler(path) for path in self.test_files]
+        checkpoint = OrganizationCheckpoint(self.base_path)
+        organizer = FileOrganizer(self.base_path)
+        real_move = CollisionResolver.move
+        calls = []
+
+        def move_then_interrupt(resolver, source):
+            calls.append(source)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            return real_move(resolver, source)
+
+        with mock.patch.object(CollisionResolver, "move", move_then_interrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                organizer.organize_files(files, checkpoint)
+
+        saved = OrganizationCheckpoint(self.base_path)
+        self.assertTrue(saved.load())
+        self.assertEqual(saved.moved_files, {"Outro": 1})
+
+        # A retomada processa o que ficou na pasta, inclusive o arquivo
+        # cuja movimentação foi interrompida.
+        remaining = [FileHandler(path) for path in self.test_files if path.exists()]
+        moved_files = FileOrganizer(self.base_path).organize_files(remaining, saved)
+
+        self.assertEqual(moved_files, {"Texto": 1, "Vídeo": 1})
+        self.assertEqual(saved.moved_files, {"Outro": 1, "Texto": 1, "Vídeo": 1})
+        self.assertTrue((self.base_path / "Textos" / "documento.txt").exists())
 
+    def test_organize_files_renames_collisions_and_drops_duplicates(self):
+        (self.base_path / "Textos").mkdir()
+        (self.base_path / "Textos" / "documento.txt").write_text("antigo")
+        (self.base_path / "Videos").mkdir()
+        (self.base_path / "Videos" / "video.mp4").touch()
+        files = [FileHandler(path) for path in self.test_files]
+        organizer = FileOrganizer(self.base_path)
+
+        moved_files = organizer.organize_files(files)
+
+        self.assertTrue((self.base_path / "Textos" / "documento (1).txt").exists())
+        self.assertEqual(
+            (self.base_path / "Textos" / "documento.txt").read_text(), "antigo"
+        )
+        self.assertFalse((self.base_path / "video.mp4").exists())
+        self.assertEqual(moved_files, {"Outro": 1, "Texto": 1})
+        self.assertEqual(organizer.renamed_count, 1)
+        self.assertEqual(organizer.deduplicated_count, 1)
+
+    def tearDown(self):
         shutil.rmtree(self.temp_dir)
 
 
@@ -0,0 +1,141 @@
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from photo_organizer.folder_lock import FolderLock, locked_folders
+from photo_organizer.models import OrganizationRequest
+from photo_organizer.service import PhotoOrganizerService
+
+
+class TestFolderLock(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir)
+        self.lock_dir = self.base_path / "locks"
+
+    def test_lock_is_exclusive_per_folder(self):
+        folder = self.base_path / "fotos"
+        other = self.base_path / "outra"
+
+        with FolderLock(folder, self.lock_dir):
+            competing = FolderLock(folder, self.lock_dir)
+            self.assertFalse(competing.acquire(blocking=False))
+            independent = FolderLock(other, self.lock_dir)
+            self.assertTrue(independent.acquire(blocking=False))
+            independent.release()
+
+        self.assertTrue(competing.acquire(blocking=False))
+        competing.release()
+
+    def test_locked_folders_holds_every_folder(self):
+        folders = [self.base_path / "a" / "Videos", self.base_path / "a"]
+
+        with locked_folders(folders, self.lock_dir):
+            for folder in folders:
+                self.assertFalse(
+                    FolderLock(folder, self.lock_dir).acquire(blocking=False)
+                )
+
+        self.assertTrue(FolderLock(folders[0], self.lock_dir).acquire(blocking=False))
+
+    def test_aliases_share_the_lock_and_relocking_fails_fast(self):
+        folder = self.base_path / "fotos"
+        folder.mkdir()
+        alias = self.base_path / "atalho"
+        alias.symlink_to(folder)
+
+        self.assertEqual(
+            FolderLock(alias, self.lock_dir).path,
+            FolderLock(folder, self.lock_dir).path,
+        )
+        with locked_folders([folder, alias, folder / "Videos" / ".."], self.lock_dir):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                other_thread = executor.submit(
+                    FolderLock(alias, self.lock_dir).acquire, blocking=False
+                )
+                self.assertFalse(other_thread.result(5))
+            with self.assertRaises(RuntimeError):
+                FolderLock(alias, self.lock_dir).acquire()
+
+        with FolderLock(alias, self.lock_dir):
+            pass
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+class TestConcurrentOrganize(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir)
+        self.service = PhotoOrganizerService(lock_dir=self.base_path / "locks")
+        self.folders = [self.base_path / "a", self.base_path / "b"]
+        for folder in self.folders:
+            folder.mkdir()
+            (folder / "video.mp4").touch()
+
+    def test_same_folder_requests_coalesce(self):
+        started = threading.Event()
+        release = threading.Event()
+        original = self.service._organize_files
+        calls = []
+
+        def slow_organize(request):
+            calls.append(request.source_folder)
+            started.set()
+            release.wait(5)
+            return original(request)
+
+        request = OrganizationRequest(source_folder=str(self.folders[0]), organize=True)
+        with mock.patch.object(self.service, "_organize_files", slow_organize):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                first = executor.submit(self.service.organize_files, request)
+                started.wait(5)
+                second = executor.submit(self.service.organize_files, request)
+                release.set()
+                results = [first.result(5), second.result(5)]
+
+        self.assertEqual(len(calls), 1)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[0].moved_files, {"Vídeo": 1})
+
+    def test_distinct_folders_run_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=5)
+        original = self.service._organize_files
+
+        def organize_together(request):
+            # Só passa se as duas pastas estiverem sendo organizadas ao mesmo tempo.
+            barrier.wait()
+            return original(request)
+
+        with mock.patch.object(self.service, "_organize_files", organize_together):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(
+                    executor.map(
+                        self.service.organize_files,
+                        [
+                            OrganizationRequest(source_folder=str(f), organize=True)
+                            for f in self.folders
+                        ],
+                    )
+                )
+
+        self.assertTrue(all(result.success for result in results))
+        for folder in self.folders:
+            self.assertTrue((folder / "Videos" / "video.mp4").exists())
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
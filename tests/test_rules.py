@@ -0,0 +1,168 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from photo_organizer.file_handler import FileHandler
+from photo_organizer.file_organizer import FileOrganizer
+from photo_organizer.models import OrganizationRequest
+from photo_organizer.rules import OrganizationRule, RuleSet, load_rules, parse_size
+from photo_organizer.service import PhotoOrganizerService
+
+RULES_TOML = """
+[[rules]]
+name = "videos-grandes"
+types = ["Vídeo"]
+min_size = "1 KB"
+folder = "Videos/Large"
+
+[[rules]]
+name = "planilhas"
+extensions = ["xlsx"]
+keep = true
+
+[[rules]]
+name = "arquivo-morto"
+older_than_days = 365
+folder = "Archive"
+"""
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir)
+        self.rules_path = self.base_path / "regras.toml"
+        self.rules_path.write_text(RULES_TOML, encoding="utf-8")
+
+        (self.base_path / "grande.mp4").write_bytes(b"0" * 2048)
+        (self.base_path / "pequeno.mp4").write_bytes(b"0" * 10)
+        (self.base_path / "planilha.xlsx").touch()
+        (self.base_path / "documento.txt").touch()
+
+        old_photo = self.base_path / "antiga.jpg"
+        old_photo.touch()
+        two_years_ago = time.time() - 2 * 365 * 86400
+        os.utime(old_photo, (two_years_ago, two_years_ago))
+        (self.base_path / "recente.jpg").touch()
+
+    def _folder_for(self, rules: RuleSet, name: str):
+        rule = rules.match(FileHandler(self.base_path / name))
+        return rule.folder if rule else "<padrão>"
+
+    def test_load_rules_compiles_decision_table(self):
+        rules = load_rules(self.rules_path)
+
+        self.assertEqual(len(rules), 3)
+        self.assertEqual(self._folder_for(rules, "grande.mp4"), "Videos/Large")
+        self.assertEqual(self._folder_for(rules, "pequeno.mp4"), "<padrão>")
+        self.assertIsNone(self._folder_for(rules, "planilha.xlsx"))
+        self.assertEqual(self._folder_for(rules, "antiga.jpg"), "Archive")
+        self.assertEqual(self._folder_for(rules, "recente.jpg"), "<padrão>")
+
+    def test_unconditional_rule_shadows_later_rules(self):
+        rules = RuleSet(
+            [
+                OrganizationRule(folder="Textos/Todos", types=["Texto"]),
+                OrganizationRule(folder="Nunca", types=["Texto"], min_size=0),
+            ]
+        )
+
+        self.assertEqual(len(rules._by_type["Texto"]), 1)
+        self.assertEqual(self._folder_for(rules, "documento.txt"), "Textos/Todos")
+
+    def test_invalid_rules_are_rejected(self):
+        with self.assertRaises(ValueError):
+            OrganizationRule.from_dict({"folder": "../fora"})
+        with self.assertRaises(ValueError):
+            OrganizationRule.from_dict({"folder": "X", "tamanho": 1})
+        with self.assertRaises(ValueError):
+            OrganizationRule.from_dict({"types": ["Vídeo"]})
+        for folder in (".", "./", "a/.."):
+            with self.assertRaises(ValueError):
+                OrganizationRule.from_dict({"folder": folder})
+        self.assertEqual(
+            OrganizationRule.from_dict({"folder": "./Videos//Large/"}).folder,
+            "Videos/Large",
+        )
+        for bad in (
+            {"folder": "X", "extensions": [4]},
+            {"folder": "X", "extensions": "mp4"},
+            {"folder": "X", "types": "Vídeo"},
+            {"folder": 5},
+            {"folder": "X", "name": 1},
+            {"keep": "false"},
+            {"folder": "X", "min_size": "2 GB", "max_size": "1 GB"},
+        ):
+            with self.assertRaises(ValueError):
+                OrganizationRule.from_dict(bad)
+        self.assertEqual(parse_size("2 GB"), 2 * 1024**3)
+        self.assertEqual(parse_size("500k"), 500 * 1024)
+
+    def test_invalid_rules_file_fails_the_request(self):
+        bad_rules = self.base_path / "invalidas.toml"
+        bad_rules.write_text('[[rules]]\nfolder = "X"\nextensions = [4]\n')
+
+        result = PhotoOrganizerService().organize_files(
+            OrganizationRequest(
+                source_folder=str(self.base_path),
+                organize=True,
+                rules_file=str(bad_rules),
+            )
+        )
+
+        self.assertFalse(result.success)
+        self.assertTrue((self.base_path / "grande.mp4").exists())
+
+    def test_organize_files_uses_rules(self):
+        files = [
+            FileHandler(path)
+            for path in self.base_path.iterdir()
+            if path.name != "regras.toml"
+        ]
+        organizer = FileOrganizer(self.base_path, load_rules(self.rules_path))
+
+        moved_files = organizer.organize_files(files)
+
+        self.assertTrue((self.base_path / "Videos" / "Large" / "grande.mp4").exists())
+        self.assertTrue((self.base_path / "Videos" / "pequeno.mp4").exists())
+        self.assertTrue((self.base_path / "Archive" / "antiga.jpg").exists())
+        self.assertTrue((self.base_path / "planilha.xlsx").exists())
+        self.assertTrue((self.base_path / "recente.jpg").exists())
+        self.assertEqual(moved_files, {"Vídeo": 2, "Texto": 1, "Imagem": 1})
+        self.assertIn("Videos/Large", organizer.folders_created)
+        self.assertEqual(
+            organizer.moved_by_folder,
+            {"Archive": 1, "Textos": 1, "Videos": 1, "Videos/Large": 1},
+        )
+        self.assertEqual(organizer.images_remaining_count, 1)
+        self.assertEqual(organizer.files_kept_count, 1)
+
+    def test_organize_files_rejects_targets_outside_source(self):
+        (self.base_path / "aqui").symlink_to(self.base_path)
+        rules = RuleSet([OrganizationRule(folder="aqui", types=["Texto"])])
+        files = [FileHandler(self.base_path / "documento.txt")]
+
+        with self.assertRaises(ValueError):
+            FileOrganizer(self.base_path, rules).organize_files(files)
+
+        outside = Path(tempfile.mkdtemp())
+        self.addCleanup(outside.rmdir)
+        (self.base_path / "fora").symlink_to(outside)
+        rules = RuleSet([OrganizationRule(folder="fora", types=["Texto"])])
+        with self.assertRaises(ValueError):
+            FileOrganizer(self.base_path, rules).organize_files(files)
+
+        self.assertTrue((self.base_path / "documento.txt").exists())
+        self.assertEqual(list(outside.iterdir()), [])
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,15 @@
+import json
+import os
 import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from photo_organizer.checkpoint import CHECKPOINT_FILE_NAME, OrganizationCheckpoint
 from photo_organizer.controller import PhotoOrganizerController
 from photo_organizer.models import OrganizationRequest
+from photo_organizer.result_cache import ResultCache
 from photo_organizer.service import PhotoOrganizerService
 
 
@@ -60,6 +66,57 @@ class TestPhotoOrganizerService(unittest.TestCase):
         self.assertGreater(len(result.moved_files), 0)
         self.assertGreater(len(result.folders_created), 0)
 
+    def test_organize_files_resume_merges_previous_segment(self):
+        # Simula uma execução interrompida logo após mover a planilha.
+        (self.base_path / "Outros").mkdir()
+        (self.base_path / "planilha.xlsx").rename(
+            self.base_path / "Outros" / "planilha.xlsx"
+        )
+        checkpoint = OrganizationCheckpoint(self.base_path.resolve())
+        checkpoint.record_folder("Outros")
+        checkpoint.advance("Outros", "Outro", moved=True)
+        checkpoint.save()
+
+        request = OrganizationRequest(
+            source_folder=str(self.base_path), organize=True, resume=True
+        )
+        result = self.service.organize_files(request)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.total_files, 4)
+        self.assertEqual(result.moved_files, {"Vídeo": 1, "Outro": 1, "Texto": 1})
+        self.assertEqual(
+            result.moved_by_folder, {"Outros": 1, "Textos": 1, "Videos": 1}
+        )
+        self.assertEqual(result.images_remaining, 1)
+        self.assertEqual(result.folders_created, ["Outros", "Textos", "Videos"])
+        self.assertEqual(result.files_by_type["Outro"], 1)
+        self.assertFalse((self.base_path / CHECKPOINT_FILE_NAME).exists())
+
+    def test_organize_files_resume_counts_previous_duplicates(self):
+        # Um segmento anterior removeu "copia.txt" como duplicado.
+        checkpoint = OrganizationCheckpoint(self.base_path.resolve())
+        checkpoint.advance("Textos", "Texto", outcome="deduplicated")
+        checkpoint.save()
+
+        request = OrganizationRequest(
+            source_folder=str(self.base_path), organize=True, resume=True
+        )
+        result = self.service.organize_files(request)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.total_files, 5)
+        self.assertEqual(result.files_by_type["Texto"], 2)
+        self.assertEqual(result.deduplicated_files, 1)
+        self.assertEqual(result.moved_files["Texto"], 1)
+
+    def test_analyze_folder_ignores_checkpoint_file(self):
+        (self.base_path / CHECKPOINT_FILE_NAME).write_text("{}")
+
+        result = self.service.analyze_folder(str(self.base_path))
+
+        self.assertEqual(result.total_files, 4)
+
     def tearDown(self):
         import shutil
 
@@ -95,6 +152,75 @@ class TestPhotoOrganizerController(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertIn("data", result)
         self.assertIn("organization_summary", result["data"])
+        summary = result["data"]["organization_summary"]
+        self.assertEqual(summary["moved_by_folder"]["Videos"], 1)
+        self.assertEqual(summary["images_remaining"], 1)
+        self.assertEqual(summary["files_kept"], 0)
+
+    def test_organize_files_endpoint_counts_duplicates_as_gone(self):
+        folder = self.base_path / "dup"
+        (folder / "Videos").mkdir(parents=True)
+        (folder / "Videos" / "a.mp4").write_bytes(b"igual")
+        (folder / "a.mp4").write_bytes(b"igual")
+        (folder / "f.jpg").touch()
+
+        result = self.controller.organize_files_endpoint(str(folder), organize=True)
+
+        summary = result["data"]["organization_summary"]
+        self.assertEqual(summary["deduplicated"], 1)
+        self.assertEqual(summary["total_moved"], 0)
+        self.assertEqual(summary["files_remaining"], 1)
+
+    def test_analyze_folder_endpoint_uses_cache_until_folder_changes(self):
+        cache = ResultCache(self.base_path / ".cache")
+        controller = PhotoOrganizerController(cache=cache)
+        folder = self.base_path / "fotos"
+        folder.mkdir()
+        (folder / "foto.jpg").touch()
+        an_hour_ago = time.time_ns() - 3600 * 10**9
+        os.utime(folder, ns=(an_hour_ago, an_hour_ago))
+
+        first = controller.analyze_folder_endpoint(str(folder))
+        with mock.patch.object(controller.service, "analyze_folder") as analyze:
+            cached = controller.analyze_folder_json_endpoint(str(folder))
+            analyze.assert_not_called()
+
+        (folder / "video.mp4").touch()
+        refreshed = controller.analyze_folder_endpoint(str(folder))
+        cache.close()
+
+        self.assertEqual(first["data"]["total_files"], 1)
+        self.assertEqual(json.loads(cached), first)
+        self.assertEqual(refreshed["data"]["total_files"], 2)
+        # A pasta acabou de mudar, então a resposta não foi gravada.
+        self.assertIsNone(cache.get(str(folder.resolve()), folder))
+
+    def test_result_cache_closes_least_recently_used_mappings(self):
+        cache = ResultCache(self.base_path / ".cache", max_mappings=2)
+        an_hour_ago = time.time_ns() - 3600 * 10**9
+        folders = []
+        for name in ("a", "b", "c"):
+            folder = self.base_path / name
+            folder.mkdir()
+            os.utime(folder, ns=(an_hour_ago, an_hour_ago))
+            self.assertTrue(cache.put(name, an_hour_ago, name.encode()))
+            folders.append(folder)
+
+        payloads = [cache.get(f.name, f) for f in folders]
+        mapped = list(cache._mappings)
+        cache.close()
+
+        self.assertEqual(payloads, [b"a", b"b", b"c"])
+        self.assertEqual(mapped, ["b", "c"])
+        self.assertFalse(cache.put("a", time.time_ns(), b"recente"))
+
+    def test_folder_statistics_endpoint(self):
+        result = self.controller.folder_statistics_endpoint(str(self.base_path))
+
+        self.assertTrue(result["success"])
+        statistics = result["data"]["statistics"]
+        self.assertEqual(statistics["total_files"], 2)
+        self.assertIn("Vídeo", statistics["by_type"])
 
     def test_get_supported_file_types_endpoint(self):
         result = self.controller.get_supported_file_types_endpoint()
@@ -0,0 +1,143 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from photo_organizer import snapshot
+from photo_organizer.controller import PhotoOrganizerController
+from photo_organizer.snapshot import diff_snapshots, iter_snapshot, write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir) / "acervo"
+        self.base_path.mkdir()
+        self.old_snapshot = Path(self.temp_dir) / "antigo.snap"
+        self.new_snapshot = Path(self.temp_dir) / "novo.snap"
+
+        (self.base_path / "Videos").mkdir()
+        (self.base_path / "Videos" / "video.mp4").write_bytes(b"video")
+        (self.base_path / "Videos.txt").write_text("lista")
+        (self.base_path / "foto.jpg").write_bytes(b"foto")
+        (self.base_path / "documento.txt").write_text("v1")
+
+    def test_write_snapshot_is_sorted_and_skips_itself(self):
+        output = self.base_path / "acervo.snap"
+
+        count = write_snapshot(self.base_path, output)
+
+        paths = [entry.path for entry in iter_snapshot(output)]
+        self.assertEqual(count, 4)
+        self.assertEqual(
+            paths, ["Videos/video.mp4", "Videos.txt", "documento.txt", "foto.jpg"]
+        )
+
+    def test_write_snapshot_skips_vanished_files_and_cleans_up_on_error(self):
+        real_digest = snapshot._file_digest
+
+        def vanish(path):
+            if path.endswith("foto.jpg"):
+                raise FileNotFoundError(path)
+            return real_digest(path)
+
+        with mock.patch.object(snapshot, "_file_digest", vanish):
+            count = write_snapshot(self.base_path, self.old_snapshot, with_hash=True)
+
+        self.assertEqual(count, 3)
+        self.assertNotIn("foto.jpg", [e.path for e in iter_snapshot(self.old_snapshot)])
+
+        with mock.patch.object(snapshot, "_file_digest", side_effect=OSError("E/S")):
+            with self.assertRaises(OSError):
+                write_snapshot(self.base_path, self.new_snapshot, with_hash=True)
+
+        self.assertFalse(self.new_snapshot.exists())
+        self.assertEqual(list(Path(self.temp_dir).glob("*.tmp")), [])
+
+    def test_diff_snapshots_detects_all_change_kinds(self):
+        write_snapshot(self.base_path, self.old_snapshot, with_hash=True)
+
+        (self.base_path / "foto.jpg").rename(self.base_path / "Videos" / "foto.jpg")
+        (self.base_path / "documento.txt").write_text("versão 2")
+        (self.base_path / "Videos.txt").unlink()
+        (self.base_path / "novo.png").write_bytes(b"novo")
+        write_snapshot(self.base_path, self.new_snapshot, with_hash=True)
+
+        changes = {
+            (change.kind, change.path, change.old_path)
+            for change in diff_snapshots(self.old_snapshot, self.new_snapshot)
+        }
+
+        self.assertEqual(
+            changes,
+            {
+                ("modified", "documento.txt", None),
+                ("moved", "Videos/foto.jpg", "foto.jpg"),
+                ("removed", "Videos.txt", None),
+                ("added", "novo.png", None),
+            },
+        )
+
+    def test_diff_detects_copy_and_delete_by_content_hash(self):
+        write_snapshot(self.base_path, self.old_snapshot, with_hash=True)
+
+        content = (self.base_path / "foto.jpg").read_bytes()
+        (self.base_path / "copia").mkdir()
+        (self.base_path / "copia" / "foto.jpg").write_bytes(content)
+        (self.base_path / "foto.jpg").unlink()
+        write_snapshot(self.base_path, self.new_snapshot, with_hash=True)
+
+        changes = list(diff_snapshots(self.old_snapshot, self.new_snapshot))
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].kind, "moved")
+        self.assertEqual(changes[0].old_path, "foto.jpg")
+
+    def test_diff_pairs_each_identical_copy_once(self):
+        (self.base_path / "a").write_bytes(b"igual")
+        (self.base_path / "b").write_bytes(b"igual")
+        write_snapshot(self.base_path, self.old_snapshot, with_hash=True)
+
+        for name in ("a", "b"):
+            (self.base_path / f"{name}2").write_bytes(b"igual")
+            (self.base_path / name).unlink()
+        write_snapshot(self.base_path, self.new_snapshot, with_hash=True)
+
+        changes = {
+            (change.kind, change.path, change.old_path)
+            for change in diff_snapshots(self.old_snapshot, self.new_snapshot)
+        }
+
+        self.assertEqual(changes, {("moved", "a2", "a"), ("moved", "b2", "b")})
+
+    def test_snapshot_endpoints(self):
+        controller = PhotoOrganizerController()
+
+        export = controller.export_snapshot_endpoint(
+            str(self.base_path), str(self.old_snapshot)
+        )
+        (self.base_path / "novo.png").write_bytes(b"novo")
+        controller.export_snapshot_endpoint(str(self.base_path), str(self.new_snapshot))
+        diff = controller.diff_snapshots_endpoint(
+            str(self.old_snapshot), str(self.new_snapshot)
+        )
+        invalid = controller.diff_snapshots_endpoint(
+            str(self.base_path / "foto.jpg"), str(self.new_snapshot)
+        )
+
+        self.assertTrue(export["success"])
+        self.assertEqual(export["data"]["total_entries"], 4)
+        self.assertTrue(diff["success"])
+        self.assertEqual(diff["data"]["added"], ["novo.png"])
+        self.assertEqual(diff["data"]["summary"]["added"], 1)
+        self.assertFalse(invalid["success"])
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from photo_organizer.controller import PhotoOrganizerController
+from photo_organizer.service import PhotoOrganizerService
+from photo_organizer.video_metadata import VideoMetadataExtractor, read_video_metadata
+
+# 2024-01-02T03:04:05Z em segundos desde 1904-01-01.
+CREATION_TIME = 3787009445
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _full_box(box_type: bytes, version: int, payload: bytes) -> bytes:
+    return _box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def _build_mp4(
+    version: int = 0, moov_first: bool = False, creation_time: int = CREATION_TIME
+) -> bytes:
+    if version == 1:
+        mvhd = _full_box(
+            b"mvhd", 1, struct.pack(">QQIQ", creation_time, 0, 1000, 12500)
+        )
+        tkhd_times = struct.pack(">QQIIQ", 0, 0, 1, 0, 12500)
+    else:
+        mvhd = _full_box(
+            b"mvhd", 0, struct.pack(">IIII", creation_time, 0, 1000, 12500)
+        )
+        tkhd_times = struct.pack(">IIIII", 0, 0, 1, 0, 12500)
+    tkhd = _full_box(
+        b"tkhd",
+        version,
+        tkhd_times + bytes(52) + struct.pack(">II", 1920 << 16, 1080 << 16),
+    )
+
+    sound_track = _box(
+        b"trak",
+        _box(b"mdia", _full_box(b"hdlr", 0, bytes(4) + b"soun" + bytes(12))),
+    )
+    stsd = _full_box(b"stsd", 0, struct.pack(">I", 1) + _box(b"avc1", bytes(78)))
+    video_track = _box(
+        b"trak",
+        tkhd
+        + _box(
+            b"mdia",
+            _full_box(b"hdlr", 0, bytes(4) + b"vide" + bytes(12))
+            + _box(b"minf", _box(b"stbl", stsd)),
+        ),
+    )
+    moov = _box(b"moov", mvhd + sound_track + video_track)
+    ftyp = _box(b"ftyp", b"isom" + bytes(4))
+    mdat = _box(b"mdat", bytes(4096))
+    return ftyp + (moov + mdat if moov_first else mdat + moov)
+
+
+class TestVideoMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_path = Path(self.temp_dir)
+
+    def test_read_video_metadata_from_headers(self):
+        for version in (0, 1):
+            path = self.base_path / f"video_v{version}.mp4"
+            path.write_bytes(_build_mp4(version=version, moov_first=bool(version)))
+
+            metadata = read_video_metadata(str(path))
+
+            self.assertEqual(metadata.duration_seconds, 12.5)
+            self.assertEqual((metadata.width, metadata.height), (1920, 1080))
+            self.assertEqual(metadata.codec, "avc1")
+            self.assertEqual(metadata.created_at, "2024-01-02T03:04:05+00:00")
+
+    def test_read_video_metadata_rejects_other_files(self):
+        path = self.base_path / "falso.mp4"
+        path.write_bytes(b"isto nao e um mp4")
+        empty = self.base_path / "vazio.mov"
+        empty.touch()
+
+        self.assertIsNone(read_video_metadata(str(path)))
+        self.assertIsNone(read_video_metadata(str(empty)))
+
+    def test_read_video_metadata_survives_corrupt_creation_time(self):
+        path = self.base_path / "corrompido.mp4"
+        path.write_bytes(_build_mp4(version=1, creation_time=2**64 - 1))
+
+        metadata = read_video_metadata(str(path))
+
+        self.assertIsNone(metadata.created_at)
+        self.assertEqual(metadata.duration_seconds, 12.5)
+        self.assertEqual(metadata.codec, "avc1")
+
+    def test_read_video_metadata_survives_truncated_boxes(self):
+        ftyp = _box(b"ftyp", b"isom" + bytes(4))
+        video_handler = _box(
+            b"mdia", _full_box(b"hdlr", 0, bytes(4) + b"vide" + bytes(12))
+        )
+        short_v1_mvhd = _full_box(
+            b"mvhd", 1, struct.pack(">IIII", CREATION_TIME, 0, 1000, 12500)
+        )
+        samples = {
+            "mvhd_vazio.mp4": ftyp + _box(b"moov", _box(b"mvhd", b"")),
+            "tkhd_vazio.mp4": ftyp
+            + _box(b"moov", _box(b"trak", video_handler + _box(b"tkhd", b""))),
+            "mvhd_v1_curto.mp4": ftyp + _box(b"moov", short_v1_mvhd),
+        }
+
+        for name, content in samples.items():
+            path = self.base_path / name
+            path.write_bytes(content)
+
+            metadata = read_video_metadata(str(path))
+
+            self.assertIsNotNone(metadata, name)
+            self.assertIsNone(metadata.duration_seconds, name)
+            self.assertIsNone(metadata.created_at, name)
+            self.assertIsNone(metadata.width, name)
+
+    def test_extractor_caches_by_stat_key(self):
+        path = self.base_path / "video.mp4"
+        path.write_bytes(_build_mp4())
+        extractor = VideoMetadataExtractor(max_workers=2)
+
+        first = extractor.extract_many([str(path), str(self.base_path / "x.mp4")])
+        second = extractor.extract(str(path))
+
+        self.assertIs(first[str(path)], second)
+        self.assertIsNone(first[str(self.base_path / "x.mp4")])
+
+    def test_analyze_folder_populates_video_fields_on_request(self):
+        (self.base_path / "video.mov").write_bytes(_build_mp4())
+        (self.base_path / "foto.jpg").touch()
+        service = PhotoOrganizerService()
+
+        result = service.analyze_folder(
+            str(self.base_path), include_video_metadata=True
+        )
+        plain = service.analyze_folder(str(self.base_path))
+
+        video = next(f for f in result.files_found if f.name == "video.mov")
+        photo = next(f for f in result.files_found if f.name == "foto.jpg")
+        self.assertEqual(video.duration_seconds, 12.5)
+        self.assertEqual(video.video_codec, "avc1")
+        self.assertEqual(video.width, 1920)
+        self.assertIsNone(photo.duration_seconds)
+        self.assertTrue(all(f.duration_seconds is None for f in plain.files_found))
+
+    def test_analyze_folder_endpoint_tolerates_corrupt_video(self):
+        (self.base_path / "video.mp4").write_bytes(_build_mp4())
+        (self.base_path / "corrompido.mp4").write_bytes(
+            _build_mp4(version=1, creation_time=2**64 - 1)
+        )
+
+        result = PhotoOrganizerController().analyze_folder_endpoint(str(self.base_path))
+
+        self.assertTrue(result["success"])
+        videos = {f["name"]: f["video"] for f in result["data"]["files"]}
+        self.assertEqual(videos["video.mp4"]["width"], 1920)
+        self.assertIsNone(videos["corrompido.mp4"]["created_at"])
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()